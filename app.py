@@ -2,11 +2,18 @@ import streamlit as st
 import pandas as pd
 import datetime
 from datetime import timedelta
+import hashlib
+import json
 import os
-import google.generativeai as genai
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from itertools import chain
 from dotenv import load_dotenv
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="Life Update v3 ✨", layout="wide", page_icon="🚀")
@@ -14,6 +21,58 @@ st.set_page_config(page_title="Life Update v3 ✨", layout="wide", page_icon="
 # PASTE YOUR GOOGLE SHEET URL HERE
 SHEET_URL = "https://docs.google.com/spreadsheets/d/YOUR_LONG_ID_HERE/edit"
 
+# How long a downloaded tab is reused before Sheets is read again, and how many tabs to keep
+CACHE_TTL_SECONDS = int(os.getenv("SHEET_CACHE_TTL", "300"))
+CACHE_MAX_TABS = int(os.getenv("SHEET_CACHE_MAX_TABS", "8"))
+
+# Where data lives: "sheets" (Google Sheets) or "sqlite" (local file, works offline)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sheets")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "life_update.db")
+
+# Journal saves are queued in this local file and sent to storage in the background
+WRITE_QUEUE_PATH = os.getenv("WRITE_QUEUE_PATH", "pending_writes.db")
+WRITE_QUEUE_BATCH_ROWS = 500
+WRITE_QUEUE_COALESCE_SECONDS = 0.5  # wait this long after a save so a burst goes out as one append
+WRITE_QUEUE_POLL_SECONDS = 5
+WRITE_QUEUE_MAX_BACKOFF_SECONDS = 60
+WRITE_QUEUE_MAX_ATTEMPTS = 10  # after this many failed sends a row is set aside (see Diagnostics)
+
+# Set PROFILE_SECTIONS=1 to time the main sections of each run (shown under Diagnostics)
+PROFILE_SECTIONS = os.getenv("PROFILE_SECTIONS") == "1"
+
+# Contacts tab layout, and the columns that identify the same person across imports
+CONTACT_COLUMNS = ["Name", "Relationship", "Phone Number", "Last Spoken", "Category"]
+JOURNAL_COLUMNS = ["Date", "Entry 1", "Entry 2", "Entry 3"]
+CONTACT_KEY_COLUMNS = ["Name", "Phone Number"]
+# Other header spellings seen in phone/CRM exports (compared lowercase)
+CONTACT_COLUMN_ALIASES = {
+    "phone": "Phone Number",
+    "mobile": "Phone Number",
+    "relation": "Relationship",
+    "last contacted": "Last Spoken",
+    "group": "Category",
+}
+# Rolodex card grid: page size choices and sort orders (column, ascending)
+CARD_PAGE_SIZES = [12, 24, 48, 96]
+CARD_SORT_OPTIONS = {
+    "Name (A-Z)": ("Name", True),
+    "Name (Z-A)": ("Name", False),
+    "Category": ("Category", True),
+    "Last Spoken (recent first)": ("Last Spoken", False),
+    "Last Spoken (longest ago)": ("Last Spoken", True),
+}
+
+# Refresher: rough token budget for the final briefing prompt, the local file day summaries
+# are kept in (so restarts don't pay for them again), and how many to keep / summarize at once
+BRIEFING_TOKEN_BUDGET = int(os.getenv("BRIEFING_TOKEN_BUDGET", "4000"))
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", "summaries.db")
+SUMMARY_CACHE_MAX_DAYS = 2000
+SUMMARY_WORKERS = 4
+
+# Rows read, validated and written per batch when importing a CSV
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "5000"))
+IMPORT_MAX_REPORTED_ERRORS = 200
+
 # --- CUSTOM CSS FOR "APP-LIKE" FEEL ---
 st.markdown("""
 <style>
@@ -46,9 +105,32 @@ st.markdown("""
 # Load local env vars (for laptop)
 load_dotenv()
 
+# --- PROFILING ---
+# Timings go in st.session_state["section_timings"] (seconds, summed per section) and are
+# reset at the start of every run, so they always describe the latest rerun.
+if PROFILE_SECTIONS:
+    st.session_state["section_timings"] = {}
+
+@contextmanager
+def timed(section):
+    """Time a block (or, as a decorator, a function) when PROFILE_SECTIONS is on."""
+    if not PROFILE_SECTIONS:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = st.session_state.setdefault("section_timings", {})
+        timings[section] = timings.get(section, 0.0) + time.perf_counter() - started
+
 # --- GOOGLE SHEETS SETUP ---
+# gspread/oauth2client (and the Gemini SDK below) are imported on first use, so sessions
+# that never touch them (e.g. the SQLite backend) don't pay for loading them.
 @st.cache_resource
-def get_google_sheet():
+def get_google_credentials():
+    from oauth2client.service_account import ServiceAccountCredentials
+
     scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
     creds = None
     
@@ -63,40 +145,930 @@ def get_google_sheet():
     # 2. FALLBACK TO LOCAL FILE
     if creds is None:
         creds = ServiceAccountCredentials.from_json_keyfile_name('secrets.json', scope)
-        
-    client = gspread.authorize(creds)
+    return creds
+
+@st.cache_resource
+def get_google_sheet():
+    import gspread
+
+    client = gspread.authorize(get_google_credentials())
     return client.open_by_url(SHEET_URL)
 
-def load_data(tab_name):
-    sh = get_google_sheet()
-    worksheet = sh.worksheet(tab_name)
-    data = worksheet.get_all_records()
-    return pd.DataFrame(data)
+# --- CONTACT SYNC ---
+def _col_letter(n):
+    """Spreadsheet column letters for 1-based column n (1 -> A, 27 -> AA)."""
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _pad_row(row, width):
+    """row padded with blanks, or cut, to width cells (Sheets drops trailing blank cells)."""
+    return (list(row) + [""] * width)[:width]
+
+def _parse_dates(values):
+    """Dates parsed from cell values, None where a value isn't a date."""
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", format="mixed")
+    return [None if pd.isna(d) else d.date() for d in parsed]
+
+def _rows_as_text(df):
+    return df.astype(object).where(df.notna(), "").astype(str).values.tolist()
+
+def _runs(positions):
+    """Collapse sorted positions into inclusive (start, end) runs of consecutive values."""
+    runs = []
+    for p in positions:
+        if runs and p == runs[-1][1] + 1:
+            runs[-1][1] = p
+        else:
+            runs.append([p, p])
+    return [tuple(r) for r in runs]
+
+def _realign_rows(header, rows, columns):
+    """Stored rows rearranged from header's column order into columns; new columns come back blank."""
+    source = {c: i for i, c in enumerate(header)}
+    return [[row[source[c]] if source.get(c, len(row)) < len(row) else "" for c in columns] for row in rows]
+
+class RowSyncPlanner:
+    """Diffs incoming rows, one batch at a time, against the rows storage already holds.
+
+    current_rows must already be in the order of columns. Rows are matched on key_columns,
+    and on a matched row only update_columns (default: all) are compared and rewritten, so
+    columns an import doesn't carry keep their stored values. A key repeated in the incoming
+    data keeps its last row, and stored rows whose key never arrives are deleted by finish().
+    Only a key and a hash are kept per row, not the rows themselves.
+    """
+
+    def __init__(self, current_rows, columns, key_columns, update_columns=None):
+        self.columns = list(columns)
+        self.update_columns = [c for c in self.columns if update_columns is None or c in update_columns]
+        self.update_idx = [self.columns.index(c) for c in self.update_columns]
+        self._key_idx = [self.columns.index(c) for c in key_columns if c in self.update_columns]
+        if not self._key_idx:
+            raise ValueError(f"Need at least one of {key_columns} to match rows")
+        self._index = {}    # key -> position in storage
+        self._digests = []  # position -> hash of the row's update_columns
+        for row in current_rows:
+            self._index.setdefault(self._key(row), len(self._digests))
+            self._digests.append(self._digest(row))
+        self._stored = len(self._digests)
+        self._seen = set()
+        self._changed = set()
+
+    def _key(self, row):
+        return tuple(row[i].strip() for i in self._key_idx)
+
+    def _digest(self, row):
+        return hash(tuple(row[i] for i in self.update_idx))
+
+    def plan(self, incoming_rows):
+        """Returns ({position: row} to overwrite, [rows] to append) for one batch."""
+        updates, appends = {}, {}
+        batch_start = len(self._digests)
+        for row in incoming_rows:
+            key, digest = self._key(row), self._digest(row)
+            pos = self._index.get(key)
+            if pos is None:
+                pos = self._index[key] = len(self._digests)
+                self._digests.append(digest)
+            if pos >= batch_start:
+                appends[pos] = row  # not written yet, so a repeat just replaces it
+            elif digest != self._digests[pos]:
+                if pos < self._stored:
+                    self._changed.add(pos)
+                updates[pos] = row
+            self._digests[pos] = digest
+            self._seen.add(pos)
+        return updates, list(appends.values())
+
+    def finish(self):
+        """Returns (positions to delete, summary)."""
+        deletes = [pos for pos in range(len(self._digests)) if pos not in self._seen]
+        summary = {"added": len(self._digests) - self._stored, "updated": len(self._changed), "removed": len(deletes)}
+        return deletes, summary
+
+# --- STORAGE BACKENDS ---
+# Both backends expose read_tab/read_tab_since/append_rows/sync_tab; the loaders and writers below
+# only talk to whichever one get_storage() returns. sync_tab() is a context manager whose
+# write() takes rows in batches; deletes are applied, and .summary set, on a clean exit.
+class SheetsStorage:
+    """Tabs of an opened gspread Spreadsheet (normally the one at SHEET_URL)."""
+
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self._date_indexes = {}  # tab_name -> {"header", "column", "last", "dates"}
+        self._index_lock = threading.Lock()
+
+    def read_tab(self, tab_name):
+        worksheet = self.spreadsheet.worksheet(tab_name)
+        return pd.DataFrame(worksheet.get_all_records())
+
+    def read_tab_since(self, tab_name, cutoff, date_column="Date"):
+        """Rows whose date_column is on or after cutoff, without downloading the rest of the tab."""
+        worksheet = self.spreadsheet.worksheet(tab_name)
+        index = self._dates(worksheet, tab_name, date_column)
+        header, dates = index["header"], index["dates"]
+        # dates[i] belongs to sheet row i + 2 (row 1 is the header)
+        wanted = [i for i, d in enumerate(dates) if d is not None and d >= cutoff]
+        last_col = _col_letter(len(header))
+        ranges = [f"A{start + 2}:{last_col}{end + 2}" for start, end in _runs(wanted)]
+        if dates and index["last"] is None:
+            # A freshly built index has only the date column; fetch its last row whole
+            # alongside the window, so the next call can check nothing moved above it
+            ranges.append(f"A{len(dates) + 1}:{last_col}{len(dates) + 1}")
+        if not ranges:
+            return pd.DataFrame(columns=header)
+        blocks = worksheet.batch_get(ranges)
+        if dates and index["last"] is None:
+            self._fingerprint(tab_name, index, blocks.pop())
+        rows = [_pad_row(row, len(header)) for block in blocks for row in block]
+        return pd.DataFrame(rows, columns=header)
+
+    def _dates(self, worksheet, tab_name, date_column):
+        """Header and parsed date_column of a tab, fetching only rows added since the last call.
+
+        Journals only grow at the bottom, so each call fetches from the last row already parsed
+        downwards. That row is fetched whole and compared with what it held before; if it
+        differs (rows were edited, inserted or deleted above it), the whole date column is
+        fetched and parsed again. Returns the index dict.
+        """
+        with self._index_lock:
+            index = self._date_indexes.get(tab_name)
+        for _ in range(3):
+            if index is None:
+                header = worksheet.row_values(1)
+                if date_column not in header:
+                    raise ValueError(f"Tab '{tab_name}' has no '{date_column}' column")
+                index = {"header": header, "column": header.index(date_column) + 1, "last": None, "dates": []}
+            if index["last"] is None:
+                index = {**index, "dates": []}  # nothing to check the dates against
+            # dates[i] is on sheet row i + 2 (row 1 is the header); "last" is the whole last row,
+            # fetched again to check it, and nothing above it is downloaded
+            known = len(index["dates"])
+            width = len(index["header"])
+            col = _col_letter(index["column"])
+            tail_range = f"A{known + 1}:{_col_letter(width)}" if known else f"{col}2:{col}"
+            header_block, tail = worksheet.batch_get(["1:1", tail_range])
+            if (header_block[0] if header_block else []) != index["header"]:
+                index = None  # columns moved since the index was built
+            elif known and _pad_row(tail[0] if tail else [], width) != index["last"]:
+                index = {**index, "last": None, "dates": []}
+            else:
+                break
+        else:
+            raise ValueError(f"Tab '{tab_name}' keeps changing while it is read")
+
+        # Past the first call the tail is whole rows, so the new last row can be kept as it is
+        new = tail[1:] if known else tail
+        date_at = index["column"] - 1 if known else 0
+        index = {**index, "last": _pad_row(new[-1], width) if known and new else index["last"],
+                 "dates": index["dates"] + _parse_dates([r[date_at] if len(r) > date_at else "" for r in new])}
+        with self._index_lock:
+            self._date_indexes[tab_name] = index
+        return index
+
+    def _fingerprint(self, tab_name, index, block):
+        """Keep block, the last indexed row fetched whole, as the index's "last", if it still matches."""
+        row = _pad_row(block[0] if block else [], len(index["header"]))
+        if _parse_dates([row[index["column"] - 1]]) != index["dates"][-1:]:
+            return  # changed since the dates were read; the next call rebuilds the index
+        with self._index_lock:
+            if self._date_indexes.get(tab_name) is index:
+                self._date_indexes[tab_name] = {**index, "last": row}
+
+    def append_rows(self, tab_name, rows):
+        worksheet = self.spreadsheet.worksheet(tab_name)
+        worksheet.append_rows(rows)
+
+    @contextmanager
+    def sync_tab(self, tab_name, columns, key_columns, update_columns=None):
+        sync = _SheetsSync(self.spreadsheet.worksheet(tab_name), columns, key_columns, update_columns)
+        # If the caller fails partway nothing is deleted: rows already written stay valid
+        yield sync
+        sync.finish()
+
+class _SheetsSync:
+    def __init__(self, worksheet, columns, key_columns, update_columns):
+        self.worksheet = worksheet
+        columns = list(columns)
+        values = worksheet.get_all_values()
+        header, current = (values[0], values[1:]) if values else ([], [])
+        if header != columns:
+            # Header and every stored row move to the new layout in one call, before any
+            # incoming row is written, so a failed sync never leaves rows under the wrong header
+            current = _realign_rows(header, current, columns)
+            width = max(len(columns), max((len(r) for r in values), default=0))
+            if width > worksheet.col_count:
+                worksheet.add_cols(width - worksheet.col_count)
+            block = [(row + [""] * width)[:width] for row in [columns] + current]  # blanks clear dropped columns
+            worksheet.batch_update([{"range": f"A1:{_col_letter(width)}{len(block)}", "values": block}])
+        self.planner = RowSyncPlanner(current, columns, key_columns, update_columns)
+        self._column_runs = _runs(self.planner.update_idx)
+
+    def write(self, rows):
+        updates, appends = self.planner.plan(rows)
+        if updates:
+            # Row 1 is the header, so list position p lives on sheet row p + 2; only the
+            # update columns are written, so the others keep what the sheet has
+            self.worksheet.batch_update([
+                {"range": f"{_col_letter(c1 + 1)}{start + 2}:{_col_letter(c2 + 1)}{end + 2}",
+                 "values": [updates[p][c1:c2 + 1] for p in range(start, end + 1)]}
+                for start, end in _runs(sorted(updates)) for c1, c2 in self._column_runs
+            ])
+        if appends:
+            self.worksheet.append_rows(appends)
+
+    def finish(self):
+        deletes, self.summary = self.planner.finish()
+        if deletes:
+            # All deleted runs in one request, bottom-up so earlier indexes stay valid
+            self.worksheet.spreadsheet.batch_update({"requests": [
+                {"deleteDimension": {"range": {"sheetId": self.worksheet.id, "dimension": "ROWS",
+                                               "startIndex": start + 1, "endIndex": end + 2}}}
+                for start, end in reversed(_runs(deletes))
+            ]})
+
+# A fresh local database is created from the CSVs that ship with the repo; there is no
+# sample work journal, so that tab starts empty
+SQLITE_SEED_FILES = {
+    "Contacts": "master_contacts.csv",
+    "Life_Journal": "journal.csv",
+}
+SQLITE_EMPTY_TABS = {"Work_Journal": JOURNAL_COLUMNS}
+SQLITE_INDEXED_COLUMNS = ["Date", "Category"]
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+class SQLiteStorage:
+    """One table per tab in a local SQLite file; every column is stored as TEXT.
+
+    A missing table is created from its CSV in seed_files, or with just the header in
+    empty_tabs.
+    """
+
+    def __init__(self, path, seed_files=None, empty_tabs=None):
+        self.path = path
+        self.seed_files = seed_files or {}
+        self.empty_tabs = empty_tabs or {}
+
+    def _connect(self):
+        # Streamlit serves each session on its own thread, so don't share connections
+        return closing(sqlite3.connect(self.path))
+
+    def _columns(self, conn, tab_name):
+        return [r[1] for r in conn.execute(f"PRAGMA table_info({_quote(tab_name)})")]
+
+    def _write_table(self, conn, tab_name, df):
+        table = _quote(tab_name)
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"CREATE TABLE {table} ({', '.join(_quote(c) + ' TEXT' for c in df.columns)})")
+        for col in SQLITE_INDEXED_COLUMNS:
+            if col in df.columns:
+                conn.execute(f"CREATE INDEX {_quote(f'idx_{tab_name}_{col}')} ON {table} ({_quote(col)})")
+        rows = df.astype(object).where(df.notna(), None).values.tolist()
+        conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(df.columns))})", rows)
+
+    def _ensure_table(self, conn, tab_name):
+        columns = self._columns(conn, tab_name)
+        if columns:
+            return columns
+        if tab_name in self.seed_files and os.path.exists(self.seed_files[tab_name]):
+            seed = pd.read_csv(self.seed_files[tab_name], dtype=str, keep_default_na=False)
+        elif tab_name in self.empty_tabs:
+            seed = pd.DataFrame(columns=self.empty_tabs[tab_name])
+        else:
+            return columns
+        with conn:
+            self._write_table(conn, tab_name, seed)
+        return seed.columns.tolist()
+
+    def read_tab(self, tab_name):
+        with self._connect() as conn:
+            if not self._ensure_table(conn, tab_name):
+                return pd.DataFrame()
+            return pd.read_sql_query(f"SELECT * FROM {_quote(tab_name)} ORDER BY rowid", conn)
+
+    def read_tab_since(self, tab_name, cutoff, date_column="Date"):
+        """Rows whose date_column is on or after cutoff; dates are ISO text, so the Date index applies."""
+        with self._connect() as conn:
+            if not self._ensure_table(conn, tab_name):
+                return pd.DataFrame()
+            return pd.read_sql_query(
+                f"SELECT * FROM {_quote(tab_name)} WHERE {_quote(date_column)} >= ? ORDER BY rowid",
+                conn, params=[str(cutoff)])
+
+    def append_rows(self, tab_name, rows):
+        with self._connect() as conn:
+            columns = self._ensure_table(conn, tab_name)
+            if not columns:
+                raise ValueError(f"No table for tab '{tab_name}'")
+            values = [(list(row) + [None] * len(columns))[:len(columns)] for row in rows]
+            with conn:
+                conn.executemany(f"INSERT INTO {_quote(tab_name)} VALUES ({', '.join('?' * len(columns))})", values)
+
+    @contextmanager
+    def sync_tab(self, tab_name, columns, key_columns, update_columns=None):
+        with self._connect() as conn:
+            existing = self._ensure_table(conn, tab_name)
+            # One transaction for the whole sync: a failed import leaves the previous table in place
+            with conn:
+                conn.execute("BEGIN")
+                sync = _SQLiteSync(self, conn, tab_name, existing, columns, key_columns, update_columns)
+                yield sync
+                sync.finish()
+
+class _SQLiteSync:
+    def __init__(self, storage, conn, tab_name, existing, columns, key_columns, update_columns):
+        self.conn = conn
+        self.table = _quote(tab_name)
+        if existing != list(columns):
+            # Rebuild the table in the new layout first; the open transaction covers it too
+            stored = conn.execute(f"SELECT * FROM {self.table} ORDER BY rowid").fetchall() if existing else []
+            current = _realign_rows(existing, [["" if v is None else str(v) for v in r] for r in stored], columns)
+            storage._write_table(conn, tab_name, pd.DataFrame(current, columns=list(columns)))
+        self.rowids = []  # storage position -> rowid
+        def stored_rows():
+            for rowid, *values in conn.execute(f"SELECT rowid, * FROM {self.table} ORDER BY rowid"):
+                self.rowids.append(rowid)
+                yield ["" if v is None else str(v) for v in values]
+        self.planner = RowSyncPlanner(stored_rows(), columns, key_columns, update_columns)
+        self._assignments = ", ".join(f"{_quote(c)} = ?" for c in self.planner.update_columns)
+        self._placeholders = ", ".join("?" * len(columns))
+
+    def write(self, rows):
+        updates, appends = self.planner.plan(rows)
+        idx = self.planner.update_idx
+        self.conn.executemany(f"UPDATE {self.table} SET {self._assignments} WHERE rowid = ?",
+                              [[row[i] for i in idx] + [self.rowids[pos]] for pos, row in updates.items()])
+        for row in appends:
+            # Later batches may update a row appended here, so remember where it went
+            self.rowids.append(self.conn.execute(f"INSERT INTO {self.table} VALUES ({self._placeholders})", row).lastrowid)
+
+    def finish(self):
+        deletes, self.summary = self.planner.finish()
+        self.conn.executemany(f"DELETE FROM {self.table} WHERE rowid = ?", [(self.rowids[pos],) for pos in deletes])
+
+@st.cache_resource
+def get_storage():
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteStorage(SQLITE_PATH, SQLITE_SEED_FILES, SQLITE_EMPTY_TABS)
+    if STORAGE_BACKEND == "sheets":
+        return SheetsStorage(get_google_sheet())
+    raise ValueError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (use 'sheets' or 'sqlite')")
+
+# --- READ CACHE ---
+# Every widget interaction reruns the whole script, so without this each rerun
+# downloaded the Contacts tab again. Contact writes below invalidate it so reads stay correct;
+# journals are read a date window at a time (load_recent) and aren't cached here.
+class SheetCache:
+    """Per-tab DataFrame cache with a TTL and least-recently-used eviction."""
+
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()  # tab_name -> (loaded_at, DataFrame, {memo name: value})
+        self._lock = threading.Lock()
+
+    def get(self, tab_name):
+        with self._lock:
+            entry = self._frames.get(tab_name)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self._frames.pop(tab_name, None)
+                self.misses += 1
+                return None
+            self._frames.move_to_end(tab_name)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, tab_name, df):
+        with self._lock:
+            self._frames[tab_name] = (time.monotonic(), df, {})
+            self._frames.move_to_end(tab_name)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+
+    def memo(self, tab_name, name, build):
+        """Return (df, build(df)) for a cached tab, calling build once per cached frame.
+
+        Returns None if the tab isn't cached. Both values come from the same entry, so
+        they always agree even if another session replaces the tab in between.
+        """
+        with self._lock:
+            entry = self._frames.get(tab_name)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                return None
+            _, df, memos = entry
+            if name not in memos:
+                memos[name] = build(df)
+            return df, memos[name]
+
+    def invalidate(self, tab_name=None):
+        with self._lock:
+            if tab_name is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(tab_name, None)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "tabs": len(self._frames)}
+
+@st.cache_resource
+def get_sheet_cache():
+    return SheetCache(CACHE_TTL_SECONDS, CACHE_MAX_TABS)
+
+# --- WRITE-BEHIND QUEUE ---
+# save_entry() returns once a row is in a local SQLite file; a background thread sends
+# queued rows to storage in batches. Each tab backs off on its own when storage pushes
+# back, and rows that keep failing are moved to a dead_letter table instead of retried forever.
+class WriteQueue:
+    """Durable queue of rows waiting to be appended to storage tabs."""
+
+    def __init__(self, path):
+        self.path = path
+        self.storage = None
+        self.last_flush_seconds = None
+        self.errors = {}  # tab_name -> latest error, while that tab's rows are being retried
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._tab_locks = {}
+        with self._connect() as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS pending (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tab_name TEXT NOT NULL,
+                row TEXT NOT NULL,
+                queued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                uncertain INTEGER NOT NULL DEFAULT 0,
+                in_flight INTEGER NOT NULL DEFAULT 0)""")
+            if "in_flight" not in {r[1] for r in conn.execute("PRAGMA table_info(pending)")}:
+                # A queue file from before in_flight was tracked
+                conn.execute("ALTER TABLE pending ADD COLUMN in_flight INTEGER NOT NULL DEFAULT 0")
+            conn.execute("""CREATE TABLE IF NOT EXISTS dead_letter (
+                id INTEGER PRIMARY KEY,
+                tab_name TEXT NOT NULL,
+                row TEXT NOT NULL,
+                queued_at REAL NOT NULL,
+                failed_at REAL NOT NULL,
+                error TEXT NOT NULL,
+                uncertain INTEGER NOT NULL)""")
+
+    def start(self, storage):
+        """Start flushing to storage, once. Rows left over from a previous process go out first."""
+        with self._lock:
+            if self.storage is None:
+                self.storage = storage
+                threading.Thread(target=self._run, name="write-queue-flusher", daemon=True).start()
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def _tab_lock(self, tab_name):
+        with self._lock:
+            return self._tab_locks.setdefault(tab_name, threading.Lock())
 
+    def enqueue(self, tab_name, row):
+        with self._connect() as conn, conn:
+            conn.execute("INSERT INTO pending (tab_name, row, queued_at) VALUES (?, ?, ?)",
+                         (tab_name, json.dumps([str(v) for v in row]), time.time()))
+        self._wake.set()
+
+    def pending(self, tab_name):
+        with self._connect() as conn:
+            return [json.loads(r[0]) for r in
+                    conn.execute("SELECT row FROM pending WHERE tab_name = ? ORDER BY id", (tab_name,))]
+
+    def read(self, tab_name, read_storage):
+        """(read_storage(), rows still queued for tab_name), taken as one snapshot.
+
+        flush() appends a tab's batch and dequeues it under the same lock, so a row is never
+        in both results, or in neither.
+        """
+        with self._tab_lock(tab_name):
+            return read_storage(), self.pending(tab_name)
+
+    def dead_letters(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT tab_name, row, failed_at, error FROM dead_letter ORDER BY id").fetchall()
+        return pd.DataFrame([(tab, ", ".join(json.loads(row)), datetime.datetime.fromtimestamp(failed_at), error)
+                             for tab, row, failed_at, error in rows], columns=["Tab", "Row", "Failed", "Error"])
+
+    def retry_dead_letters(self):
+        """Queue every set-aside row again, with a fresh count of attempts."""
+        with self._connect() as conn, conn:
+            conn.execute("""INSERT INTO pending (id, tab_name, row, queued_at, uncertain)
+                            SELECT id, tab_name, row, queued_at, uncertain FROM dead_letter""")
+            conn.execute("DELETE FROM dead_letter")
+        self._wake.set()
+
+    def stats(self):
+        with self._connect() as conn:
+            depth, oldest = conn.execute("SELECT COUNT(*), MIN(queued_at) FROM pending").fetchone()
+            dead, = conn.execute("SELECT COUNT(*) FROM dead_letter").fetchone()
+        errors = "; ".join(f"{tab}: {error}" for tab, error in list(self.errors.items()))
+        return {"depth": depth, "oldest_age": time.time() - oldest if oldest else None, "dead": dead,
+                "last_flush_seconds": self.last_flush_seconds, "last_error": errors or None}
+
+    def _run(self):
+        failures, retry_at = {}, {}  # per tab
+        while True:
+            now = time.monotonic()
+            self._wake.wait(max(0, min([WRITE_QUEUE_POLL_SECONDS] + [at - now for at in retry_at.values()])))
+            time.sleep(WRITE_QUEUE_COALESCE_SECONDS)
+            self._wake.clear()
+            now = time.monotonic()
+            try:
+                failed = self.flush(skip={tab for tab, at in retry_at.items() if at > now})
+            except Exception as e:
+                self.errors["write queue"] = f"{type(e).__name__}: {e}"  # the local file itself failed
+                continue
+            self.errors.pop("write queue", None)
+            for tab_name in list(retry_at):
+                if retry_at[tab_name] <= now and tab_name not in failed:
+                    del retry_at[tab_name], failures[tab_name]
+            for tab_name in failed:
+                # Exponential backoff with jitter; saves arriving meanwhile just wait in the file
+                failures[tab_name] = failures.get(tab_name, 0) + 1
+                backoff = min(WRITE_QUEUE_MAX_BACKOFF_SECONDS, 2 ** failures[tab_name])
+                retry_at[tab_name] = now + backoff * random.uniform(0.5, 1.0)
+
+    def flush(self, skip=()):
+        """Append queued rows to storage, one call per tab, skipping tabs in skip.
+
+        A tab whose call fails keeps its rows queued and the other tabs carry on. Returns
+        the tabs that failed.
+        """
+        with self._connect() as conn:
+            tabs = [r[0] for r in conn.execute("SELECT DISTINCT tab_name FROM pending")]
+        failed = []
+        for tab_name in tabs:
+            if tab_name in skip:
+                continue
+            try:
+                self._flush_tab(tab_name)
+            except Exception as e:
+                if self._mark_failed(tab_name, e):
+                    self.errors[tab_name] = f"{type(e).__name__}: {e}"
+                    failed.append(tab_name)
+                else:
+                    self.errors.pop(tab_name, None)  # nothing left to retry; see dead_letters()
+            else:
+                self.errors.pop(tab_name, None)
+        return failed
+
+    def _flush_tab(self, tab_name):
+        with self._connect() as conn:
+            queued = conn.execute("""SELECT id, row, uncertain OR in_flight FROM pending
+                                     WHERE tab_name = ? ORDER BY id LIMIT ?""",
+                                  (tab_name, WRITE_QUEUE_BATCH_ROWS)).fetchall()
+        entries = [(entry_id, json.loads(row), unsure) for entry_id, row, unsure in queued]
+        with self._tab_lock(tab_name):
+            # Still in flight means an earlier flush sent the rows but never dequeued them
+            # (e.g. the process died in between), so they may already be in the tab
+            if any(e[2] for e in entries):
+                entries = self._not_yet_written(tab_name, entries)
+            started = time.perf_counter()
+            if entries:
+                with self._connect() as conn, conn:
+                    conn.executemany("UPDATE pending SET in_flight = 1 WHERE id = ?", [(e[0],) for e in entries])
+                self.storage.append_rows(tab_name, [e[1] for e in entries])
+            self.last_flush_seconds = time.perf_counter() - started
+            with self._connect() as conn, conn:
+                conn.executemany("DELETE FROM pending WHERE id = ?", [(r[0],) for r in queued])
+
+    def _mark_failed(self, tab_name, error):
+        """Count a failed attempt for the tab's queued rows. Returns how many are still queued.
+
+        If Sheets answered (quota, 429, 5xx...) none of the rows were written; after a timeout
+        or dropped connection the append may still have gone through, so the rows are
+        checked against the tab before the next attempt. Only a Sheets answer clears in_flight.
+        """
+        uncertain = not _is_sheets_api_error(error)
+        with self._connect() as conn, conn:
+            conn.execute("""UPDATE pending SET attempts = attempts + 1, uncertain = MAX(uncertain, ?),
+                                               in_flight = CASE WHEN ? THEN in_flight ELSE 0 END
+                            WHERE id IN (SELECT id FROM pending WHERE tab_name = ? ORDER BY id LIMIT ?)""",
+                         (int(uncertain), int(uncertain), tab_name, WRITE_QUEUE_BATCH_ROWS))
+            conn.execute("""INSERT INTO dead_letter (id, tab_name, row, queued_at, failed_at, error, uncertain)
+                            SELECT id, tab_name, row, queued_at, ?, ?, uncertain FROM pending
+                            WHERE tab_name = ? AND attempts >= ?""",
+                         (time.time(), f"{type(error).__name__}: {error}", tab_name, WRITE_QUEUE_MAX_ATTEMPTS))
+            conn.execute("DELETE FROM pending WHERE tab_name = ? AND attempts >= ?",
+                         (tab_name, WRITE_QUEUE_MAX_ATTEMPTS))
+            return conn.execute("SELECT COUNT(*) FROM pending WHERE tab_name = ?", (tab_name,)).fetchone()[0]
+
+    def _not_yet_written(self, tab_name, entries):
+        """Drop entries whose rows already reached the tab during an attempt that looked failed."""
+        try:
+            since = min(datetime.date.fromisoformat(e[1][0]) for e in entries)
+            existing = self.storage.read_tab_since(tab_name, since)
+        except ValueError:
+            existing = self.storage.read_tab(tab_name)  # first column isn't a date; check everything
+        width = len(existing.columns)
+        present = {}
+        for row in existing.astype(str).values.tolist():
+            present[tuple(row)] = present.get(tuple(row), 0) + 1
+        remaining = []
+        for entry in entries:
+            key = tuple((entry[1] + [""] * width)[:width])
+            if present.get(key):
+                present[key] -= 1
+            else:
+                remaining.append(entry)
+        return remaining
+
+def _is_sheets_api_error(e):
+    import gspread  # only reached after a failed write
+
+    return isinstance(e, gspread.exceptions.APIError)
+
+@st.cache_resource
+def get_write_queue():
+    # No storage yet: opening the queue (e.g. for Diagnostics) must not need credentials
+    return WriteQueue(WRITE_QUEUE_PATH)
+
+def _running_write_queue():
+    queue = get_write_queue()
+    queue.start(get_storage())
+    return queue
+
+def _with_pending(df, pending):
+    """Add rows still waiting in the write queue, so a fresh read includes recent saves."""
+    if not pending or len(df.columns) == 0:
+        return df
+    width = len(df.columns)
+    rows = [(row + [""] * width)[:width] for row in pending]
+    return pd.concat([df, pd.DataFrame(rows, columns=df.columns)], ignore_index=True)
+
+def _load_frame(tab_name):
+    cache = get_sheet_cache()
+    df = cache.get(tab_name)
+    if df is None:
+        with timed(f"read_tab:{tab_name}"):
+            df = _with_pending(*_running_write_queue().read(tab_name, lambda: get_storage().read_tab(tab_name)))
+        cache.put(tab_name, df)
+    return df
+
+@timed("load_recent")
+def load_recent(tab_names, cutoff):
+    """Rows dated on or after cutoff for each tab, as {tab_name: DataFrame}.
+
+    The tabs are read from storage concurrently, asking only for the date window, plus
+    any of their rows still waiting in the write queue.
+    """
+    # Resolved here: the worker threads have no Streamlit context
+    storage, queue = get_storage(), _running_write_queue()
+    frames = {}
+    with ThreadPoolExecutor(max_workers=len(tab_names)) as pool:
+        fetched = pool.map(lambda t: queue.read(t, lambda: storage.read_tab_since(t, cutoff)), tab_names)
+        for tab_name, (df, pending) in zip(tab_names, fetched):
+            df = _with_pending(df, pending)
+            frames[tab_name] = df[pd.to_datetime(df["Date"], errors="coerce") >= pd.Timestamp(cutoff)].copy()
+    return frames
+
+def _contact_search_index(df):
+    if df.empty:
+        return pd.Series(dtype=str)
+    return (df["Name"].astype(str) + " " + df["Category"].astype(str)).str.lower()
+
+@timed("load_contacts")
+def load_contacts():
+    """Contacts plus a lowercase "name category" Series for the Rolodex search box.
+
+    The index is built once per cached frame rather than on every rerun. The frame is
+    shared with the cache, so treat it as read-only.
+    """
+    df = _load_frame("Contacts")
+    cached = get_sheet_cache().memo("Contacts", "search", _contact_search_index)
+    if cached is None:
+        # Evicted between the two calls; build a one-off index
+        return df, _contact_search_index(df)
+    return cached
+
+@timed("save_entry")
 def save_entry(tab_name, data_list):
-    sh = get_google_sheet()
-    worksheet = sh.worksheet(tab_name)
-    worksheet.append_row(data_list)
+    """Queue a row for tab_name and return; the write queue delivers it in the background."""
+    _running_write_queue().enqueue(tab_name, data_list)
 
+@timed("update_contacts_sheet")
 def update_contacts_sheet(df):
-    sh = get_google_sheet()
-    worksheet = sh.worksheet("Contacts")
-    worksheet.clear()
-    worksheet.append_row(df.columns.tolist())
-    worksheet.append_rows(df.values.tolist())
+    """Sync the Contacts tab to df, writing only rows that changed. Returns added/updated/removed counts."""
+    with get_storage().sync_tab("Contacts", [str(c) for c in df.columns], CONTACT_KEY_COLUMNS) as sync:
+        sync.write(_rows_as_text(df))
+    get_sheet_cache().invalidate("Contacts")
+    return sync.summary
+
+# --- CONTACT IMPORT ---
+def _contact_column_map(raw_columns):
+    """Map uploaded header names onto CONTACT_COLUMNS, ignoring case, spacing and known aliases."""
+    canonical = {c.lower(): c for c in CONTACT_COLUMNS}
+    mapping = {}
+    for raw in raw_columns:
+        key = str(raw).strip().lower()
+        target = canonical.get(key) or CONTACT_COLUMN_ALIASES.get(key)
+        if target and target not in mapping.values():
+            mapping[raw] = target
+    if "Name" not in mapping.values():
+        raise ValueError("CSV needs a 'Name' column")
+    return mapping
+
+def normalize_contacts(chunk, mapping):
+    """Clean one chunk of an upload. Returns (rows, errors) where errors are (row number, message).
+
+    Columns the upload doesn't have come back blank (Category as "Uncategorized"); the sync
+    only uses those defaults for new contacts.
+    """
+    df = chunk[list(mapping)].rename(columns=mapping).reindex(columns=CONTACT_COLUMNS)
+    df = df.fillna("").apply(lambda col: col.str.strip())
+    errors = []
+
+    missing_name = df["Name"] == ""
+    errors += [(i + 1, "missing Name, row skipped") for i in df.index[missing_name]]
+    df = df[~missing_name].copy()
+
+    spoken = pd.to_datetime(df["Last Spoken"], errors="coerce", format="mixed")
+    bad_date = spoken.isna() & (df["Last Spoken"] != "")
+    errors += [(i + 1, f"unreadable Last Spoken '{v}', left blank") for i, v in df.loc[bad_date, "Last Spoken"].items()]
+    df["Last Spoken"] = spoken.dt.strftime("%Y-%m-%d").fillna("")
+    df.loc[df["Category"] == "", "Category"] = "Uncategorized"
+
+    errors.sort()
+    return df.values.tolist(), errors
+
+@timed("import_contacts")
+def import_contacts(csv_file, on_progress=None):
+    """Stream a contacts CSV into the Contacts tab, IMPORT_CHUNK_ROWS rows at a time.
+
+    Only one chunk of the upload is in memory at once. Raises ValueError if the file has
+    no usable header or no valid rows, in which case no contact is added, changed or
+    removed (a tab whose header differs is still rewritten in CONTACT_COLUMNS order).
+    """
+    total_bytes = getattr(csv_file, "size", 0)
+    chunks = pd.read_csv(csv_file, dtype=str, keep_default_na=False, chunksize=IMPORT_CHUNK_ROWS)
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError("CSV has no rows")
+    mapping = _contact_column_map(first.columns)
+
+    # Matched contacts only take the columns the file actually has
+    present = [c for c in CONTACT_COLUMNS if c in mapping.values()]
+    errors, error_count, written = [], 0, 0
+    with get_storage().sync_tab("Contacts", CONTACT_COLUMNS, CONTACT_KEY_COLUMNS, present) as sync:
+        for chunk in chain([first], chunks):
+            rows, chunk_errors = normalize_contacts(chunk, mapping)
+            error_count += len(chunk_errors)
+            errors += chunk_errors[:IMPORT_MAX_REPORTED_ERRORS - len(errors)]
+            sync.write(rows)
+            written += len(rows)
+            if on_progress and total_bytes:
+                on_progress(min(csv_file.tell() / total_bytes, 1.0))
+        if not written:
+            # Leaving the block with an error skips deletes, so the old contacts survive
+            raise ValueError("No valid contacts in CSV")
+    get_sheet_cache().invalidate("Contacts")
+    return {**sync.summary, "errors": errors, "error_count": error_count}
 
 # --- GEMINI AI SETUP ---
-api_key = None
-try:
-    if "GEMINI_API_KEY" in st.secrets:
-        api_key = st.secrets["GEMINI_API_KEY"]
-except:
-    pass
-if api_key is None:
-    api_key = os.getenv("GEMINI_API_KEY")
-
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-2.5-flash')
+@st.cache_resource
+def get_model():
+    import google.generativeai as genai
+
+    api_key = None
+    try:
+        if "GEMINI_API_KEY" in st.secrets:
+            api_key = st.secrets["GEMINI_API_KEY"]
+    except:
+        pass
+    if api_key is None:
+        api_key = os.getenv("GEMINI_API_KEY")
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-2.5-flash')
+
+# --- BRIEFING PIPELINE ---
+# Each journal day is summarized once and cached under a hash of its rows. A briefing uses
+# the cached summary where there is one and the raw entries otherwise, so it can start
+# streaming at once; the days that went in raw are summarized on a background thread afterwards.
+class SummaryCache:
+    """Day summaries in a local SQLite file, keyed by content hash, least recently used dropped first."""
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        with self._connect() as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS summaries (
+                digest TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                used_at REAL NOT NULL)""")
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def get_many(self, digests):
+        """{digest: summary} for those of digests that are cached."""
+        if not digests:
+            return {}
+        marks = ", ".join("?" * len(digests))
+        with self._connect() as conn, conn:
+            found = dict(conn.execute(f"SELECT digest, summary FROM summaries WHERE digest IN ({marks})", digests))
+            conn.execute(f"UPDATE summaries SET used_at = ? WHERE digest IN ({marks})", [time.time(), *digests])
+        return found
+
+    def put(self, digest, summary):
+        with self._connect() as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)", (digest, summary, time.time()))
+            conn.execute("DELETE FROM summaries WHERE digest NOT IN "
+                         "(SELECT digest FROM summaries ORDER BY used_at DESC LIMIT ?)", (self.max_entries,))
+
+@st.cache_resource
+def get_summary_cache():
+    return SummaryCache(SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_DAYS)
+
+def _estimate_tokens(text):
+    # ~4 characters per token is close enough for budgeting and needs no API call
+    return len(text) // 4 + 1
+
+def journal_days(df, cutoff):
+    """(date, entries text) for each day on or after cutoff, newest first. df['Date'] must be dates."""
+    recent = df[df["Date"] >= cutoff]
+    entry_cols = [c for c in recent.columns if c != "Date"]
+    days = []
+    for date, group in recent.groupby("Date"):
+        entries = [str(v).strip() for v in group[entry_cols].values.ravel() if str(v).strip()]
+        if entries:
+            days.append((date, "\n".join(f"- {e}" for e in entries)))
+    return sorted(days, reverse=True)
+
+def _day_digest(label, date, text):
+    return hashlib.sha256(f"{label}|{date}|{text}".encode()).hexdigest()
+
+def _summarize_day(model, label, date, text):
+    prompt = (f"Summarize this {label.lower()} journal entry for {date} in one or two short sentences. "
+              f"Keep names, numbers and decisions.\n\n{text}")
+    return model.generate_content(prompt).text.strip()
+
+@timed("cached_summaries")
+def cached_summaries(label, days):
+    """[(date, summary or None, text)] for (date, text) days; None where the day isn't summarized yet."""
+    digests = [_day_digest(label, date, text) for date, text in days]
+    found = get_summary_cache().get_many(digests)
+    return [(date, found.get(digest), text) for (date, text), digest in zip(days, digests)]
+
+def summarize_days(model, cache, label, days):
+    """Summarize (date, text) days with the model, SUMMARY_WORKERS at a time, into cache."""
+    def summarize(day):
+        cache.put(_day_digest(label, *day), _summarize_day(model, label, *day))
+    with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as pool:
+        list(pool.map(summarize, days))
+
+def summarize_in_background(model, cache, unsummarized):
+    """Summarize {label: [(date, text)]} on a daemon thread; returns the thread without waiting.
+
+    model and cache are passed in rather than looked up: the thread has no Streamlit context.
+    """
+    def run():
+        for label, days in unsummarized.items():
+            summarize_days(model, cache, label, days)
+    thread = threading.Thread(target=run, name="briefing-summarizer", daemon=True)
+    thread.start()
+    return thread
+
+@timed("build_briefing_prompt")
+def build_briefing_prompt(sections, token_budget):
+    """Fit the newest days of each section into token_budget.
+
+    sections maps a heading to [(date, summary or None, text)] newest first; days without a
+    summary go in as their raw entries. Days are taken newest first across all sections until
+    one doesn't fit; it and every older day are left out. Returns (prompt, days left out).
+    """
+    header = ("Act as my Chief of Staff. Here are my recent days, newest first "
+              "(a short summary, or the raw entries for days not summarized yet):\n")
+    footer = ('\nGive me a combined "State of the Union" briefing.\n'
+              'Start with "High Level" (Work & Life combined), then specific action items or patterns you notice.\n')
+    remaining = token_budget - _estimate_tokens(header + footer)
+    # Spend the budget newest day first across all sections, so older days are what gets cut
+    candidates = sorted(((date, heading, summary, text) for heading, days in sections.items()
+                         for date, summary, text in days), key=lambda c: c[0], reverse=True)
+    kept = {heading: [] for heading in sections}
+    omitted = 0
+    for i, (date, heading, summary, text) in enumerate(candidates):
+        line = f"{date}: {summary}" if summary is not None else f"{date}:\n{text}"
+        cost = _estimate_tokens(line)
+        if cost > remaining:
+            # Stop here rather than skip it, so a gap never opens between the days kept
+            omitted = len(candidates) - i
+            break
+        remaining -= cost
+        kept[heading].append(line)
+    body = "".join(f"\n{heading}:\n" + ("\n".join(lines) or "(nothing recorded)") + "\n"
+                   for heading, lines in kept.items())
+    return header + body + footer, omitted
 
 st.title("Life Update v3 ✨")
 
@@ -108,28 +1080,54 @@ with tab1:
     with col2:
         with st.expander("Import Contacts"):
             uploaded_file = st.file_uploader("Upload CSV", type=["csv"])
-            if uploaded_file:
-                new_data = pd.read_csv(uploaded_file)
-                if "Category" not in new_data.columns:
-                    new_data["Category"] = "Uncategorized"
-                update_contacts_sheet(new_data)
-                st.success("Uploaded!")
+            # The uploader keeps its file across reruns, so try each upload once, whatever the outcome
+            if uploaded_file and st.session_state.get("imported_file_id") != uploaded_file.file_id:
+                st.session_state["imported_file_id"] = uploaded_file.file_id
+                st.session_state["import_result"] = st.session_state["import_error"] = None
+                progress = st.progress(0.0, text="Importing contacts...")
+                try:
+                    result = import_contacts(uploaded_file, on_progress=lambda f: progress.progress(f, text="Importing contacts..."))
+                except ValueError as e:
+                    st.session_state["import_error"] = f"Import failed: {e}"
+                except Exception as e:
+                    # A storage error (e.g. a Sheets quota error) partway through: batches
+                    # already written stay, nothing is deleted, and uploading again finishes it
+                    st.session_state["import_error"] = f"Import stopped partway, nothing was removed: {e}"
+                else:
+                    st.session_state["import_result"] = result
                 st.rerun()
 
+            if st.session_state.get("import_error"):
+                st.error(st.session_state["import_error"])
+            result = st.session_state.get("import_result")
+            if result:
+                st.success(f"Uploaded! {result['added']} added, {result['updated']} updated, {result['removed']} removed")
+                if result["error_count"]:
+                    st.warning(f"{result['error_count']} rows had problems")
+                    st.dataframe(pd.DataFrame(result["errors"], columns=["Row", "Problem"]), hide_index=True)
+
     try:
-        contact_data = load_data("Contacts")
+        contact_data, search_index = load_contacts()
     except:
-        contact_data = pd.DataFrame()
+        contact_data, search_index = pd.DataFrame(), pd.Series(dtype=str)
 
     if not contact_data.empty:
         # Filter Logic
         categories = ["All Contacts"] + list(contact_data["Category"].unique())
         selected_category = col1.selectbox("Filter:", categories)
-        
-        if selected_category == "All Contacts":
-            filtered_data = contact_data
-        else:
-            filtered_data = contact_data[contact_data["Category"] == selected_category]
+        s1, s2, s3 = st.columns([3, 2, 1])
+        query = s1.text_input("Search:", placeholder="Name or category").strip().lower()
+        sort_options = [k for k, (col, _) in CARD_SORT_OPTIONS.items() if col in contact_data.columns]
+        sort_label = s2.selectbox("Sort:", sort_options)
+        page_size = s3.selectbox("Per page:", CARD_PAGE_SIZES)
+
+        # Boolean masks over the whole frame, then a single selection
+        mask = pd.Series(True, index=contact_data.index)
+        if selected_category != "All Contacts":
+            mask &= contact_data["Category"] == selected_category
+        if query:
+            mask &= search_index.str.contains(query, regex=False)
+        filtered_data = contact_data[mask]
         
         # METRICS
         m1, m2, m3 = st.columns(3)
@@ -147,20 +1145,34 @@ with tab1:
         
         # CARD GRID VIEW (Instead of Dataframe)
         st.write(f"### {selected_category}")
+
+        sort_col, ascending = CARD_SORT_OPTIONS[sort_label]
+        filtered_data = filtered_data.sort_values(
+            sort_col, ascending=ascending, key=lambda col: col.astype(str).str.lower(), kind="stable")
+
+        # Only the current page gets widgets; a new filter/search/sort starts back on page 1
+        pages = max(1, -(-len(filtered_data) // page_size))
+        page = st.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, value=1, step=1,
+                               key=f"page_{selected_category}_{query}_{sort_label}_{page_size}_{len(filtered_data)}")
+        start = (page - 1) * page_size
+        st.caption(f"Showing {min(start + 1, len(filtered_data))}-{min(start + page_size, len(filtered_data))} "
+                   f"of {len(filtered_data)}")
         
         # Create a grid of cards
-        for index, row in filtered_data.iterrows():
-            with st.container():
-                c1, c2 = st.columns([1, 4])
-                with c1:
-                    st.write("👤") # Avatar placeholder
-                with c2:
-                    st.write(f"**{row['Name']}**")
-                    st.caption(f"{row['Category']}")
-                    # If you have a 'Phone' column, display it
-                    if 'Phone' in row:
-                        st.write(f"📞 {row['Phone']}")
-                st.divider()
+        with timed("rolodex_cards"):
+            for row in filtered_data.iloc[start:start + page_size].to_dict("records"):
+                with st.container():
+                    c1, c2 = st.columns([1, 4])
+                    with c1:
+                        st.write("👤") # Avatar placeholder
+                    with c2:
+                        st.write(f"**{row['Name']}**")
+                        st.caption(f"{row['Category']}")
+                        # If you have a phone column, display it
+                        phone = row.get("Phone Number") or row.get("Phone")
+                        if phone:
+                            st.write(f"📞 {phone}")
+                    st.divider()
 
     else:
         st.info("Upload a CSV to start.")
@@ -172,39 +1184,39 @@ with tab2:
     timeframe = st.selectbox("Period:", ["Last 7 Days", "Last 30 Days"])
     
     if st.button("Generate Briefing", type="primary"):
-        with st.spinner("Analyzing databases..."):
-            try:
-                # Load both journals
-                life_df = load_data("Life_Journal")
-                work_df = load_data("Work_Journal")
-                
-                # Convert dates
+        try:
+            with st.spinner("Analyzing databases..."):
+                # Load both journals, only the days in the period
                 today = datetime.date.today()
                 cutoff = today - timedelta(days=7 if timeframe == "Last 7 Days" else 30)
-                
-                # Filter
+                recent = load_recent(["Life_Journal", "Work_Journal"], cutoff)
+                life_df, work_df = recent["Life_Journal"], recent["Work_Journal"]
+
+                # Convert dates
                 life_df['Date'] = pd.to_datetime(life_df['Date']).dt.date
                 work_df['Date'] = pd.to_datetime(work_df['Date']).dt.date
-                
-                recent_life = life_df[life_df['Date'] >= cutoff]
-                recent_work = work_df[work_df['Date'] >= cutoff]
-                
-                prompt = f"""
-                Act as my Chief of Staff. Here is my recent data:
-                
-                LIFE DATA:
-                {recent_life.to_string()}
-                
-                WORK DATA:
-                {recent_work.to_string()}
-                
-                Give me a combined "State of the Union" briefing. 
-                Start with "High Level" (Work & Life combined), then specific action items or patterns you notice.
-                """
-                res = model.generate_content(prompt)
-                st.markdown(res.text)
-            except Exception as e:
-                st.error(f"Error: {e}")
+
+                model = get_model()
+                notes = {"Life": cached_summaries("Life", journal_days(life_df, cutoff)),
+                         "Work": cached_summaries("Work", journal_days(work_df, cutoff))}
+                prompt, omitted = build_briefing_prompt(
+                    {"LIFE DATA": notes["Life"], "WORK DATA": notes["Work"]}, BRIEFING_TOKEN_BUDGET)
+
+            unsummarized = {label: [(date, text) for date, summary, text in days if summary is None]
+                            for label, days in notes.items()}
+            raw_days = sum(len(days) for days in unsummarized.values())
+            st.caption(f"{sum(len(days) for days in notes.values()) - raw_days} journal days from cached summaries, "
+                       f"{raw_days} as raw entries. Prompt ~{_estimate_tokens(prompt)} tokens"
+                       + (f", {omitted} oldest days left out to fit the budget." if omitted else "."))
+            with timed("briefing_stream"):
+                res = model.generate_content(prompt, stream=True)
+                st.write_stream(chunk.text for chunk in res)
+
+            # The briefing is on screen; summarize the raw days off the script thread for next time
+            if raw_days:
+                summarize_in_background(model, get_summary_cache(), unsummarized)
+        except Exception as e:
+            st.error(f"Error: {e}")
 
 # --- HELPER FOR JOURNALS ---
 def render_journal(tab_name, sheet_tab):
@@ -224,4 +1236,31 @@ def render_journal(tab_name, sheet_tab):
 with tab3:
     render_journal("Life Journal", "Life_Journal")
 with tab4:
-    render_journal("Work Updates", "Work_Journal")
\ No newline at end of file
+    render_journal("Work Updates", "Work_Journal")
+
+# --- DIAGNOSTICS ---
+with st.sidebar.expander("Diagnostics"):
+    cache_stats = get_sheet_cache().stats()
+    st.caption(f"Sheet cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+               f"({cache_stats['tabs']} tabs, TTL {CACHE_TTL_SECONDS}s)")
+    write_queue = get_write_queue()
+    queue_stats = write_queue.stats()
+    st.caption(f"Write queue: {queue_stats['depth']} pending"
+               + (f", oldest {queue_stats['oldest_age']:.0f}s" if queue_stats["oldest_age"] is not None else "")
+               + (f", last flush {queue_stats['last_flush_seconds'] * 1000:.0f} ms"
+                  if queue_stats["last_flush_seconds"] is not None else ""))
+    if queue_stats["last_error"]:
+        st.caption(f"Last write error (retrying): {queue_stats['last_error']}")
+    if queue_stats["dead"]:
+        st.warning(f"Saves set aside after {WRITE_QUEUE_MAX_ATTEMPTS} failed attempts: {queue_stats['dead']}")
+        st.dataframe(write_queue.dead_letters(), hide_index=True)
+        if st.button("Retry failed saves"):
+            write_queue.retry_dead_letters()
+            st.rerun()
+    if PROFILE_SECTIONS:
+        timings = st.session_state.get("section_timings", {})
+        st.dataframe(pd.DataFrame({"Section": list(timings), "ms": [t * 1000 for t in timings.values()]}).round(1),
+                     hide_index=True)
+    if st.button("Refresh data"):
+        get_sheet_cache().invalidate()
+        st.rerun()
@@ -0,0 +1,216 @@
+"""Benchmark the app's data paths against in-process fakes of Sheets and Gemini.
+
+For each size (contacts and rows per journal) this builds a FakeSpreadsheet of synthetic
+data shaped like master_contacts.csv / journal.csv, runs app.py under Streamlit's AppTest
+with gspread and google.generativeai patched to the fakes, and reports for each path:
+
+  * latency of the script run (or of the function call, for non-UI paths),
+  * Sheets API calls by method and Gemini calls,
+  * peak Python memory allocated during the step (tracemalloc), and
+  * the app's own PROFILE_SECTIONS timings for that run.
+
+Usage, from the repo root:
+
+    python benchmarks/data_paths.py                        # 1k, 10k and 100k rows
+    python benchmarks/data_paths.py --sizes 1000 --api-latency-ms 150 --model-latency-ms 800
+    python benchmarks/data_paths.py --json before.json     # save results to compare later
+    python benchmarks/data_paths.py --no-memory            # skip tracemalloc (it slows Python code)
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest import mock
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fakes  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+
+def _call_app_function(app_path, name, args, before_call):
+    # Runs as an AppTest script: execute app.py for its functions, then time one of them
+    import runpy
+    import time
+
+    import streamlit as st
+
+    app = runpy.run_path(app_path)
+    st.session_state["section_timings"] = {}  # keep only the call's own sections
+    before_call()
+    started = time.perf_counter()
+    app[name](*args)
+    st.session_state["bench_seconds"] = time.perf_counter() - started
+
+
+class Bench:
+    def __init__(self, size, args):
+        self.size = size
+        self.args = args
+        self.sheet = fakes.FakeSpreadsheet({
+            "Contacts": [fakes.CONTACT_HEADER] + fakes.synthetic_contacts(size),
+            "Life_Journal": [fakes.JOURNAL_HEADER] + fakes.synthetic_journal(size, seed=1),
+            "Work_Journal": [fakes.JOURNAL_HEADER] + fakes.synthetic_journal(size, seed=2),
+        }, latency=args.api_latency_ms / 1000)
+        self.model = fakes.StubModel(latency=args.model_latency_ms / 1000)
+        self.results = []
+        self._baseline = None
+
+    def _start(self):
+        self._baseline = (self.sheet.api_calls.copy(), self.model.calls, time.perf_counter(),
+                          tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def _finish(self, scenario, at, seconds=None):
+        calls, model_calls, started, memory = self._baseline
+        elapsed = time.perf_counter() - started
+        api = dict(self.sheet.api_calls - calls)
+        timings = at.session_state["section_timings"] if "section_timings" in at.session_state else {}
+        if at.exception:
+            raise RuntimeError(f"{scenario}: app raised {at.exception[0].message}")
+        self.results.append({
+            "size": self.size,
+            "scenario": scenario,
+            "ms": round((seconds if seconds is not None else elapsed) * 1000, 1),
+            "api_calls": sum(api.values()),
+            "api_breakdown": api,
+            "model_calls": self.model.calls - model_calls,
+            "peak_mb": (round((tracemalloc.get_traced_memory()[1] - memory) / 1e6, 1)
+                        if tracemalloc.is_tracing() else None),
+            "sections_ms": {k: round(v * 1000, 1) for k, v in timings.items()},
+        })
+
+    def _call(self, scenario, name, *call_args):
+        at = AppTest.from_function(_call_app_function, default_timeout=self.args.timeout,
+                                   args=(APP_PATH, name, call_args, self._start))
+        at.run()
+        self._finish(scenario, at, seconds=at.session_state["bench_seconds"])
+
+    def run(self):
+        at = AppTest.from_file(APP_PATH, default_timeout=self.args.timeout)
+
+        self._start()
+        at.run()
+        self._finish("rolodex: first render (cold)", at)
+
+        self._start()
+        at.run()
+        self._finish("rolodex: rerun (cached)", at)
+
+        self._start()
+        at.text_input[0].input("contact 12").run()
+        self._finish("rolodex: search", at)
+
+        next(s for s in at.selectbox if s.label == "Period:").select("Last 30 Days")
+        self._start()
+        next(b for b in at.button if b.label == "Generate Briefing").click().run()
+        seconds = time.perf_counter() - self._baseline[2]
+        # The new days are summarized on a background thread after the run; wait for it so its
+        # model calls are counted here (and not in the next step), but time only the script run
+        for thread in threading.enumerate():
+            if thread.name == "briefing-summarizer":
+                thread.join(self.args.timeout)
+        self._finish("refresher: 30-day briefing (cold)", at, seconds=seconds)
+
+        self._start()
+        next(b for b in at.button if b.label == "Generate Briefing").click().run()
+        self._finish("refresher: 30-day briefing (summaries cached)", at)
+
+        # Saves are flushed by a background thread. Hold its append until the ack is measured,
+        # then let it go and wait for the row to land, so each step counts only its own calls
+        journal = self.sheet.worksheet("Life_Journal")
+        released, append_rows = threading.Event(), journal.append_rows
+
+        def held_append_rows(*call_args, **kwargs):
+            released.wait()
+            return append_rows(*call_args, **kwargs)
+
+        with mock.patch.object(journal, "append_rows", held_append_rows):
+            at.tabs[2].text_area[0].input("benchmark entry")
+            self._start()
+            at.tabs[2].button[0].click().run()
+            self._finish("journal: save entry (ack)", at)
+
+            self._start()
+            rows = len(journal.rows)
+            released.set()
+            deadline = time.time() + self.args.timeout
+            while len(journal.rows) == rows and time.time() < deadline:
+                time.sleep(0.01)
+            self._finish("journal: save entry (background flush)", at)
+
+        # One percent of contacts edited, one percent new, one percent gone
+        changed = max(1, self.size // 100)
+        contacts = fakes.synthetic_contacts(self.size)
+        for row in contacts[:changed]:
+            row[1] = "Edited"
+        del contacts[-changed:]
+        contacts += [[f"New {i}", "Friend", f"556-{i:07d}", "2026-01-01", "Work"] for i in range(changed)]
+        self._call("update_contacts_sheet (1% changed)", "update_contacts_sheet",
+                   pd.DataFrame(contacts, columns=fakes.CONTACT_HEADER))
+
+        upload = io.BytesIO("\n".join(",".join(r) for r in [fakes.CONTACT_HEADER] + contacts).encode())
+        upload.size = len(upload.getvalue())
+        self._call("import_contacts (CSV upload, no changes)", "import_contacts", upload)
+        return self.results
+
+
+def print_report(results):
+    print(f"{'rows':>7}  {'scenario':<46} {'ms':>9} {'api':>5} {'llm':>4} {'peak MB':>8}  slowest sections")
+    for r in results:
+        sections = sorted(r["sections_ms"].items(), key=lambda kv: kv[1], reverse=True)[:3]
+        peak = f"{r['peak_mb']:8.1f}" if r["peak_mb"] is not None else f"{'-':>8}"
+        print(f"{r['size']:>7}  {r['scenario']:<46} {r['ms']:>9.1f} {r['api_calls']:>5} {r['model_calls']:>4} {peak}  "
+              + ", ".join(f"{k} {v:.0f}ms" for k, v in sections))
+        if r["api_breakdown"]:
+            print(f"{'':>57}" + ", ".join(f"{k}={v}" for k, v in sorted(r["api_breakdown"].items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated row counts")
+    parser.add_argument("--api-latency-ms", type=float, default=0, help="simulated delay per Sheets call")
+    parser.add_argument("--model-latency-ms", type=float, default=0, help="simulated delay per Gemini call")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per script run")
+    parser.add_argument("--no-memory", action="store_true", help="don't trace allocations")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    os.environ.update({"STORAGE_BACKEND": "sheets", "PROFILE_SECTIONS": "1"})
+    if not args.no_memory:
+        tracemalloc.start()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            bench = Bench(size, args)
+            # Fresh queue and summary files and cleared resource caches, so each size starts cold
+            os.environ["WRITE_QUEUE_PATH"] = os.path.join(tmp_dir, f"queue_{size}.db")
+            os.environ["SUMMARY_CACHE_PATH"] = os.path.join(tmp_dir, f"summaries_{size}.db")
+            st.cache_resource.clear()
+            with mock.patch("gspread.authorize", return_value=fakes.FakeClient(bench.sheet)), \
+                    mock.patch("oauth2client.service_account.ServiceAccountCredentials.from_json_keyfile_name"), \
+                    mock.patch("google.generativeai.configure"), \
+                    mock.patch("google.generativeai.GenerativeModel", return_value=bench.model):
+                results += bench.run()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
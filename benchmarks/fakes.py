@@ -0,0 +1,190 @@
+"""In-process stand-ins for Google Sheets and Gemini, plus synthetic data, for the benchmarks.
+
+FakeSpreadsheet/FakeWorksheet implement the subset of gspread the app calls and count
+every call, so a benchmark can report API usage without a network. StubModel answers
+generate_content() (including stream=True) instantly or after a fixed delay.
+"""
+import datetime
+import random
+import re
+import threading
+import time
+import types
+from collections import Counter
+
+CONTACT_HEADER = ["Name", "Relationship", "Phone Number", "Last Spoken", "Category"]
+JOURNAL_HEADER = ["Date", "Entry 1", "Entry 2", "Entry 3"]
+
+RELATIONSHIPS = ["Friend", "Former Colleague", "College Roommate", "Mentor", "Cousin", "Neighbor"]
+CATEGORIES = ["Close Friends", "Work", "Family", "Network / Acquaintances"]
+WORDS = ("had board meeting flew back Boston gym squat dinner team budget review grocery "
+         "sourdough call investor weekly planning hired shipped release coffee run read").split()
+
+
+def synthetic_contacts(n, seed=0):
+    """n contact rows shaped like master_contacts.csv (header not included)."""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    return [[f"Contact {i}", rng.choice(RELATIONSHIPS), f"555-{i:07d}",
+             str(today - datetime.timedelta(days=rng.randrange(730))), rng.choice(CATEGORIES)]
+            for i in range(n)]
+
+
+def synthetic_journal(n, seed=0):
+    """n daily rows shaped like journal.csv, oldest first (the order the app appends in)."""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    return [[str(today - datetime.timedelta(days=n - 1 - i))]
+            + ["I " + " ".join(rng.choices(WORDS, k=rng.randint(5, 20))) for _ in range(3)]
+            for i in range(n)]
+
+
+def _a1(cell):
+    """'C12' -> (12, 3); a bare column 'C' -> (None, 3); a bare row '12' -> (12, None)."""
+    letters, digits = re.fullmatch(r"([A-Z]*)(\d*)", cell).groups()
+    col = 0
+    for ch in letters:
+        col = col * 26 + ord(ch) - 64
+    return (int(digits) if digits else None), (col or None)
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, sheet_id, rows):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.rows = [list(map(str, r)) for r in rows]
+        self.col_count = max(26, max((len(r) for r in self.rows), default=0))
+
+    @property
+    def row_count(self):
+        return max(1000, len(self.rows))
+
+    def _call(self, name):
+        self.spreadsheet.record(name)
+
+    def _block(self, range_name):
+        start, end = range_name.split(":") if ":" in range_name else (range_name, range_name)
+        (r1, c1), (r2, c2) = _a1(start), _a1(end)
+        r1, r2 = r1 or 1, r2 or len(self.rows)
+        c1, c2 = c1 or 1, c2 or self.col_count
+        return [row[c1 - 1:c2] for row in self.rows[r1 - 1:r2]]
+
+    def _write(self, range_name, values):
+        row, col = _a1(range_name.split(":")[0])
+        for i, new in enumerate(values):
+            while len(self.rows) < row + i:
+                self.rows.append([])
+            target = self.rows[row - 1 + i]
+            target.extend([""] * (col - 1 + len(new) - len(target)))
+            target[col - 1:col - 1 + len(new)] = [str(v) for v in new]
+
+    # -- reads --
+    def get_all_records(self):
+        self._call("get_all_records")
+        if not self.rows:
+            return []
+        header = self.rows[0]
+        return [dict(zip(header, row + [""] * (len(header) - len(row)))) for row in self.rows[1:]]
+
+    def get_all_values(self):
+        self._call("get_all_values")
+        return [list(r) for r in self.rows]
+
+    def row_values(self, row):
+        self._call("row_values")
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def batch_get(self, ranges, **kwargs):
+        self._call("batch_get")
+        return [self._block(r) for r in ranges]
+
+    # -- writes --
+    def append_row(self, values, **kwargs):
+        self._call("append_row")
+        self.rows.append([str(v) for v in values])
+
+    def append_rows(self, values, **kwargs):
+        self._call("append_rows")
+        self.rows.extend([str(v) for v in row] for row in values)
+
+    def update(self, values, range_name="A1", **kwargs):
+        self._call("update")
+        self._write(range_name, values)
+
+    def batch_update(self, data, **kwargs):
+        self._call("batch_update")
+        for item in data:
+            self._write(item["range"], item["values"])
+
+    def batch_clear(self, ranges):
+        self._call("batch_clear")
+        for range_name in ranges:
+            (r1, c1), (r2, c2) = [_a1(cell) for cell in range_name.split(":")]
+            for row in self.rows[r1 - 1:r2]:
+                for c in range(c1 - 1, min(c2, len(row))):
+                    row[c] = ""
+
+    def clear(self):
+        self._call("clear")
+        self.rows = []
+
+    def add_rows(self, n):
+        self._call("add_rows")
+
+    def add_cols(self, n):
+        self._call("add_cols")
+        self.col_count += n
+
+
+class FakeSpreadsheet:
+    """A spreadsheet whose tabs live in memory. api_calls counts calls by method name."""
+
+    def __init__(self, tabs, latency=0.0):
+        self.latency = latency
+        self.api_calls = Counter()
+        self._lock = threading.Lock()
+        self._tabs = {name: FakeWorksheet(self, i, rows) for i, (name, rows) in enumerate(tabs.items())}
+
+    def record(self, name):
+        with self._lock:
+            self.api_calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def worksheet(self, name):
+        return self._tabs[name]
+
+    def batch_update(self, body):
+        self.record("spreadsheet.batch_update")
+        for request in body["requests"]:
+            span = request["deleteDimension"]["range"]
+            worksheet = next(ws for ws in self._tabs.values() if ws.id == span["sheetId"])
+            del worksheet.rows[span["startIndex"]:span["endIndex"]]
+
+
+class FakeClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open_by_url(self, url):
+        return self.spreadsheet
+
+
+class StubModel:
+    """Stands in for genai.GenerativeModel; counts calls and prompt size."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+        if self.latency:
+            time.sleep(self.latency)
+        if stream:
+            return iter([types.SimpleNamespace(text=word + " ") for word in "High Level: all good.".split()])
+        return types.SimpleNamespace(text="A short summary of the day.")
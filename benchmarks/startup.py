@@ -0,0 +1,97 @@
+"""Cold-start benchmark for app.py.
+
+Runs the app in fresh Python processes (so nothing is already imported or cached),
+using the SQLite backend seeded from the repo's CSVs so no network or credentials
+are needed. Reports:
+
+  * an import-time profile (``python -X importtime``) of the first script run,
+    grouped by top-level package, and
+  * time to first render: process start until AppTest finishes the first run.
+
+Usage, from the repo root:
+
+    python benchmarks/startup.py                      # 5 runs, top 15 packages
+    python benchmarks/startup.py --runs 10 --top 25
+    python benchmarks/startup.py --max-first-render 3.0   # exit 1 if the median is slower
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Child process: render app.py once and print how long it took from interpreter start
+RENDER_SNIPPET = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120).run()
+if at.exception:
+    sys.exit("app.py raised: " + at.exception[0].message)
+print(time.perf_counter() - float(sys.argv[1]))
+"""
+
+
+def _child_env(tmp_dir):
+    env = dict(os.environ)
+    env.update({
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_PATH": os.path.join(tmp_dir, "bench.db"),
+        "WRITE_QUEUE_PATH": os.path.join(tmp_dir, "queue.db"),
+    })
+    return env
+
+
+def first_render_seconds(tmp_dir, importtime=False):
+    """Returns (seconds to first render, stderr) for one fresh process."""
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else [])
+    started = time.perf_counter()
+    proc = subprocess.run(cmd + ["-c", RENDER_SNIPPET, str(started)], cwd=REPO_ROOT, env=_child_env(tmp_dir),
+                          capture_output=True, text=True)
+    if proc.returncode:
+        sys.exit(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "render failed")
+    # perf_counter is system-wide on Linux/macOS, so this includes interpreter start-up
+    return float(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def import_profile(stderr):
+    """Self time per top-level package from ``-X importtime`` output, in seconds."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us) / 1e6
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to time (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="packages to list in the import profile")
+    parser.add_argument("--max-first-render", type=float, help="fail if the median first render is slower (seconds)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The first run also seeds the SQLite file, so it only feeds the import profile
+        _, stderr = first_render_seconds(tmp_dir, importtime=True)
+        timings = [first_render_seconds(tmp_dir)[0] for _ in range(args.runs)]
+
+    profile = import_profile(stderr)
+    print(f"Import time by package (self time, total {sum(t for _, t in profile):.2f}s):")
+    for package, seconds in profile[:args.top]:
+        print(f"  {package:<30} {seconds * 1000:8.1f} ms")
+    print(f"\nTime to first render over {args.runs} runs: median {statistics.median(timings):.2f}s, "
+          f"min {min(timings):.2f}s, max {max(timings):.2f}s")
+
+    if args.max_first_render is not None and statistics.median(timings) > args.max_first_render:
+        print(f"FAIL: median first render above {args.max_first_render:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
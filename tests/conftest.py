@@ -0,0 +1,38 @@
+"""Shared setup for the tests.
+
+app.py is a Streamlit script, so importing it renders the page once in bare mode. Point
+its storage, write queue and summary cache at a scratch directory first so the repo
+stays clean.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SCRATCH = tempfile.mkdtemp(prefix="life_update_tests_")
+atexit.register(shutil.rmtree, _SCRATCH, ignore_errors=True)
+
+os.environ.update({
+    "STORAGE_BACKEND": "sqlite",
+    "SQLITE_PATH": os.path.join(_SCRATCH, "life_update.db"),
+    "WRITE_QUEUE_PATH": os.path.join(_SCRATCH, "pending_writes.db"),
+    "SUMMARY_CACHE_PATH": os.path.join(_SCRATCH, "summaries.db"),
+})
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, "benchmarks")]
+
+SEED_FILES = {
+    "Contacts": os.path.join(REPO_ROOT, "master_contacts.csv"),
+    "Life_Journal": os.path.join(REPO_ROOT, "journal.csv"),
+}
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    """A SQLiteStorage seeded like the app's: from the repo's CSVs, Work_Journal empty."""
+    import app
+
+    return app.SQLiteStorage(str(tmp_path / "storage.db"), SEED_FILES, app.SQLITE_EMPTY_TABS)
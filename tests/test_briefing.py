@@ -0,0 +1,68 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+import app
+from fakes import StubModel
+
+DAY1, DAY2 = datetime.date(2026, 2, 10), datetime.date(2026, 2, 11)
+
+
+@pytest.fixture
+def summary_cache(tmp_path, monkeypatch):
+    cache = app.SummaryCache(str(tmp_path / "summaries.db"), max_entries=3)
+    monkeypatch.setattr(app, "get_summary_cache", lambda: cache)
+    return cache
+
+
+def test_journal_days_newest_first_skips_empty_days():
+    df = pd.DataFrame({"Date": [DAY1, DAY2, DAY2, DAY1 - datetime.timedelta(days=5)],
+                       "Entry 1": ["a", "b", "", "old"], "Entry 2": ["", "c", " ", ""]})
+    assert app.journal_days(df, DAY1) == [(DAY2, "- b\n- c"), (DAY1, "- a")]
+    assert app.journal_days(df.assign(**{"Entry 1": ""}), DAY1) == [(DAY2, "- c")]
+
+
+def test_summary_cache_survives_a_new_instance_and_evicts_least_recent(summary_cache):
+    for i in range(3):
+        summary_cache.put(f"d{i}", f"s{i}")
+    summary_cache.get_many(["d0"])  # d1 is now the least recently used
+    summary_cache.put("d3", "s3")
+    reopened = app.SummaryCache(summary_cache.path, max_entries=3)
+    assert reopened.get_many(["d0", "d1", "d2", "d3"]) == {"d0": "s0", "d2": "s2", "d3": "s3"}
+
+
+def test_unsummarized_days_go_in_raw_and_are_summarized_after(summary_cache):
+    model = StubModel()
+    days = [(DAY2, "- shipped the release"), (DAY1, "- team dinner")]
+    notes = app.cached_summaries("Work", days)
+    assert notes == [(DAY2, None, "- shipped the release"), (DAY1, None, "- team dinner")]
+    prompt, omitted = app.build_briefing_prompt({"WORK DATA": notes}, 1000)
+    assert f"{DAY2}:\n- shipped the release" in prompt and omitted == 0
+    assert model.calls == 0
+
+    app.summarize_in_background(model, summary_cache, {"Work": days}).join()
+    assert model.calls == 2
+    notes = app.cached_summaries("Work", days)
+    assert [summary for _, summary, _ in notes] == ["A short summary of the day."] * 2
+    # Same label, date and text only: an edited day or another journal is summarized again
+    assert app.cached_summaries("Life", days)[0][1] is None
+    assert app.cached_summaries("Work", [(DAY2, "- shipped it")])[0][1] is None
+
+
+def test_build_briefing_prompt_drops_oldest_days_over_budget():
+    sections = {"LIFE DATA": [(DAY2, "new life", "-"), (DAY1, "old life " * 50, "-")],
+                "WORK DATA": [(DAY1, None, "- old work " * 50)]}
+    base, _ = app.build_briefing_prompt({}, 10_000)
+    prompt, omitted = app.build_briefing_prompt(sections, app._estimate_tokens(base) + 50)
+    assert "new life" in prompt and "old" not in prompt
+    assert omitted == 2
+    assert "WORK DATA:\n(nothing recorded)" in prompt
+
+
+def test_build_briefing_prompt_stops_at_the_first_day_that_does_not_fit():
+    sections = {"LIFE DATA": [(DAY2, "long day " * 50, "-"), (DAY1, "short day", "-")]}
+    base, _ = app.build_briefing_prompt({}, 10_000)
+    prompt, omitted = app.build_briefing_prompt(sections, app._estimate_tokens(base) + 50)
+    # DAY1 would fit on its own, but keeping it would leave out a newer day
+    assert "short day" not in prompt and omitted == 2
@@ -0,0 +1,214 @@
+import io
+import os
+
+import pytest
+
+import app
+from conftest import REPO_ROOT
+from fakes import CONTACT_HEADER, FakeSpreadsheet
+
+ALICE = ["Alice", "Friend", "555-0101", "2026-01-15", "Close Friends"]
+BOB = ["Bob", "Former Colleague", "555-0102", "2025-11-20", "Work"]
+CHARLIE = ["Charlie", "College Roommate", "555-0103", "2026-02-01", "Family"]
+DIANA = ["Diana", "Mentor", "555-0104", "2025-08-10", "Network / Acquaintances"]
+
+
+def sheets_storage(rows):
+    sheet = FakeSpreadsheet({"Contacts": [CONTACT_HEADER] + rows})
+    return app.SheetsStorage(sheet), sheet.worksheet("Contacts")
+
+
+def sync(storage, batches, columns=CONTACT_HEADER):
+    with storage.sync_tab("Contacts", columns, app.CONTACT_KEY_COLUMNS) as s:
+        for batch in batches:
+            s.write([list(r) for r in batch])
+    return s
+
+
+class Boom(Exception):
+    pass
+
+
+# --- RowSyncPlanner ---
+
+def test_planner_insert_update_delete():
+    planner = app.RowSyncPlanner([ALICE, BOB, CHARLIE], CONTACT_HEADER, app.CONTACT_KEY_COLUMNS)
+    bob = BOB[:4] + ["Family"]
+    updates, appends = planner.plan([ALICE, bob, DIANA])
+    assert updates == {1: bob}
+    assert appends == [DIANA]
+    assert planner.finish() == ([2], {"added": 1, "updated": 1, "removed": 1})
+
+
+def test_planner_compares_only_update_columns():
+    columns = ["Name", "Relationship", "Phone Number"]
+    planner = app.RowSyncPlanner([ALICE], CONTACT_HEADER, app.CONTACT_KEY_COLUMNS, columns)
+    assert planner.update_idx == [0, 1, 2]
+    assert planner.plan([ALICE[:3] + ["", "Uncategorized"]]) == ({}, [])
+    moved = ["Alice", "Mentor", "555-0101", "", "Uncategorized"]
+    assert planner.plan([moved]) == ({0: moved}, [])
+
+
+def test_planner_keys_on_the_key_columns_present():
+    planner = app.RowSyncPlanner([ALICE], CONTACT_HEADER, app.CONTACT_KEY_COLUMNS, ["Name", "Category"])
+    assert planner.plan([["Alice", "", "", "", "Work"]]) == ({0: ["Alice", "", "", "", "Work"]}, [])
+
+
+def test_planner_duplicate_incoming_key_keeps_last_row():
+    planner = app.RowSyncPlanner([ALICE], CONTACT_HEADER, app.CONTACT_KEY_COLUMNS)
+    first, last = DIANA[:4] + ["Work"], DIANA[:4] + ["Family"]
+    _, appends = planner.plan([first, ALICE, last])
+    assert appends == [last]
+    # ...and across batches it becomes an update of the row already appended
+    updates, appends = planner.plan([first])
+    assert (updates, appends) == ({1: first}, [])
+    assert planner.finish()[1] == {"added": 1, "updated": 0, "removed": 0}
+
+
+def test_planner_duplicate_stored_key_drops_the_extra_copy():
+    planner = app.RowSyncPlanner([ALICE, ALICE], CONTACT_HEADER, app.CONTACT_KEY_COLUMNS)
+    assert planner.plan([ALICE]) == ({}, [])
+    assert planner.finish()[0] == [1]
+
+
+def test_planner_needs_a_key_column():
+    with pytest.raises(ValueError):
+        app.RowSyncPlanner([], ["Relationship"], app.CONTACT_KEY_COLUMNS)
+
+
+def test_realign_rows():
+    assert app._realign_rows(["Phone Number", "Name"], [["555", "Al"], ["556"]], ["Name", "Phone Number", "Category"]) \
+        == [["Al", "555", ""], ["", "556", ""]]
+
+
+# --- Sheets backend ---
+
+def test_sheets_sync_writes_only_changes():
+    storage, ws = sheets_storage([ALICE, BOB, CHARLIE, DIANA])
+    api = ws.spreadsheet.api_calls
+    bob = BOB[:4] + ["Family"]
+    s = sync(storage, [[ALICE, bob], [CHARLIE, ["Eve", "Friend", "555-0105", "", "Work"]]])
+    assert s.summary == {"added": 1, "updated": 1, "removed": 1}
+    assert ws.rows == [CONTACT_HEADER, ALICE, bob, CHARLIE, ["Eve", "Friend", "555-0105", "", "Work"]]
+    assert api["batch_update"] == 1 and api["append_rows"] == 1 and "clear" not in api
+
+
+def test_sheets_sync_update_leaves_other_columns_alone():
+    storage, ws = sheets_storage([ALICE, BOB])
+    with storage.sync_tab("Contacts", CONTACT_HEADER, app.CONTACT_KEY_COLUMNS, ["Name", "Phone Number", "Last Spoken"]) as s:
+        s.write([["Alice", "", "555-0101", "2026-03-01", ""], ["Bob", "?", "555-0102", "2026-03-02", "?"]])
+    assert ws.rows[1:] == [ALICE[:3] + ["2026-03-01", ALICE[4]], BOB[:3] + ["2026-03-02", BOB[4]]]
+    assert s.summary == {"added": 0, "updated": 2, "removed": 0}
+
+
+def test_sheets_sync_deletes_runs_bottom_up():
+    rows = [[f"P{i}", "", f"555-{i}", "", ""] for i in range(8)]
+    storage, ws = sheets_storage(rows)
+    keep = [rows[0], rows[3], rows[4], rows[7]]
+    sync(storage, [keep])
+    assert ws.rows == [CONTACT_HEADER] + keep
+    # Runs 1-2 and 5-6 (sheet rows 3-4 and 7-8) in a single request
+    assert ws.spreadsheet.api_calls["spreadsheet.batch_update"] == 1
+
+
+def test_sheets_sync_header_change_rewrites_stored_rows():
+    sheet = FakeSpreadsheet({"Contacts": [["Phone Number", "Name", "Category", "Notes"],
+                                          ["555-0101", "Alice", "Close Friends", "x"],
+                                          ["555-0102", "Bob", "Work", "y"]]})
+    ws = sheet.worksheet("Contacts")
+    s = sync(app.SheetsStorage(sheet), [[ALICE]])
+    assert ws.rows == [CONTACT_HEADER, ALICE]
+    assert s.summary == {"added": 0, "updated": 1, "removed": 1}
+
+
+def test_sheets_sync_failure_after_header_change_keeps_rows_aligned():
+    sheet = FakeSpreadsheet({"Contacts": [["Phone Number", "Name", "Category"],
+                                          ["555-0101", "Alice", "Close Friends"],
+                                          ["555-0102", "Bob", "Work"]]})
+    ws = sheet.worksheet("Contacts")
+    with pytest.raises(Boom):
+        with app.SheetsStorage(sheet).sync_tab("Contacts", CONTACT_HEADER, app.CONTACT_KEY_COLUMNS) as s:
+            s.write([list(ALICE)])
+            raise Boom
+    assert ws.rows[0] == CONTACT_HEADER
+    assert ws.rows[1:] == [ALICE, ["Bob", "", "555-0102", "", "Work"]]
+
+
+def test_sheets_sync_failure_partway_deletes_nothing():
+    storage, ws = sheets_storage([ALICE, BOB, CHARLIE])
+    with pytest.raises(Boom):
+        with storage.sync_tab("Contacts", CONTACT_HEADER, app.CONTACT_KEY_COLUMNS) as s:
+            s.write([list(DIANA)])
+            raise Boom
+    assert ws.rows == [CONTACT_HEADER, ALICE, BOB, CHARLIE, DIANA]
+
+
+# --- SQLite backend ---
+
+def test_sqlite_sync_insert_update_delete(sqlite_storage):
+    bob = BOB[:4] + ["Family"]
+    eve = ["Eve", "Friend", "555-0105", "", "Work"]
+    s = sync(sqlite_storage, [[ALICE, bob], [CHARLIE, eve]])
+    assert s.summary == {"added": 1, "updated": 1, "removed": 1}
+    assert sqlite_storage.read_tab("Contacts").values.tolist() == [ALICE, bob, CHARLIE, eve]
+
+
+def test_sqlite_sync_update_of_row_appended_in_earlier_batch(sqlite_storage):
+    eve, eve2 = ["Eve", "Friend", "555-0105", "", "Work"], ["Eve", "Friend", "555-0105", "", "Family"]
+    sync(sqlite_storage, [[ALICE, BOB, CHARLIE, DIANA, eve], [eve2]])
+    assert sqlite_storage.read_tab("Contacts").values.tolist()[-1] == eve2
+
+
+def test_sqlite_sync_header_change(sqlite_storage):
+    columns = ["Name", "Phone Number", "Category"]
+    s = sync(sqlite_storage, [[["Alice", "555-0101", "Work"]]], columns=columns)
+    df = sqlite_storage.read_tab("Contacts")
+    assert df.columns.tolist() == columns
+    assert df.values.tolist() == [["Alice", "555-0101", "Work"]]
+    assert s.summary == {"added": 0, "updated": 1, "removed": 3}
+
+
+def test_sqlite_sync_failure_rolls_back(sqlite_storage):
+    before = sqlite_storage.read_tab("Contacts")
+    for columns in (CONTACT_HEADER, ["Name", "Phone Number"]):
+        with pytest.raises(Boom):
+            with sqlite_storage.sync_tab("Contacts", columns, app.CONTACT_KEY_COLUMNS) as s:
+                s.write([["Zed", "", "555-9999", "", ""][:len(columns)]])
+                raise Boom
+        assert sqlite_storage.read_tab("Contacts").equals(before)
+
+
+def test_sqlite_sync_update_leaves_other_columns_alone(sqlite_storage):
+    with sqlite_storage.sync_tab("Contacts", CONTACT_HEADER, app.CONTACT_KEY_COLUMNS, ["Name", "Phone Number", "Category"]) as s:
+        s.write([list(ALICE), list(BOB), list(CHARLIE), ["Diana", "", "555-0104", "", "Work"]])
+    assert sqlite_storage.read_tab("Contacts").values.tolist()[-1] == DIANA[:4] + ["Work"]
+    assert s.summary == {"added": 0, "updated": 1, "removed": 0}
+
+
+# --- CSV import ---
+
+def test_import_without_category_keeps_stored_categories(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "get_storage", lambda: sqlite_storage)
+    before = sqlite_storage.read_tab("Contacts")
+    with open(os.path.join(REPO_ROOT, "test_contacts.csv"), "rb") as f:
+        result = app.import_contacts(f)
+    assert (result["added"], result["updated"], result["removed"]) == (0, 0, 0)
+    assert sqlite_storage.read_tab("Contacts").equals(before)
+
+
+def test_import_new_contact_gets_defaults(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "get_storage", lambda: sqlite_storage)
+    upload = io.BytesIO(b"name,mobile,Last Contacted\nAlice,555-0101,March 3 2026\nZed,555-0199,nope\n,555-0000,\n")
+    result = app.import_contacts(upload)
+    assert (result["added"], result["updated"], result["removed"]) == (1, 1, 3)
+    assert [r[0] for r in result["errors"]] == [2, 3]
+    df = sqlite_storage.read_tab("Contacts")
+    assert df.values.tolist() == [ALICE[:3] + ["2026-03-03", ALICE[4]], ["Zed", "", "555-0199", "", "Uncategorized"]]
+
+
+def test_import_with_no_valid_rows_changes_nothing(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "get_storage", lambda: sqlite_storage)
+    before = sqlite_storage.read_tab("Contacts")
+    with pytest.raises(ValueError, match="No valid contacts"):
+        app.import_contacts(io.BytesIO(b"Name,Phone Number\n,555-0101\n"))
+    assert sqlite_storage.read_tab("Contacts").equals(before)
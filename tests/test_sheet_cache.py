@@ -0,0 +1,76 @@
+import time
+
+import pandas as pd
+import pytest
+
+import app
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def frame(n):
+    return pd.DataFrame({"Name": [f"P{i}" for i in range(n)]})
+
+
+def test_get_returns_the_frame_until_the_ttl_passes(clock):
+    cache = app.SheetCache(ttl_seconds=60, max_entries=4)
+    df = frame(2)
+    assert cache.get("Contacts") is None
+    cache.put("Contacts", df)
+    clock[0] += 60
+    assert cache.get("Contacts") is df
+    clock[0] += 1
+    assert cache.get("Contacts") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "tabs": 0}
+
+
+def test_least_recently_used_tab_is_evicted(clock):
+    cache = app.SheetCache(ttl_seconds=60, max_entries=2)
+    cache.put("A", frame(1))
+    cache.put("B", frame(1))
+    cache.get("A")
+    cache.put("C", frame(1))
+    assert cache.get("B") is None
+    assert cache.get("A") is not None and cache.get("C") is not None
+
+
+def test_memo_builds_once_per_cached_frame(clock):
+    cache = app.SheetCache(ttl_seconds=60, max_entries=2)
+    builds = []
+    build = lambda df: builds.append(len(df)) or len(df)
+    assert cache.memo("Contacts", "n", build) is None
+    cache.put("Contacts", frame(3))
+    assert cache.memo("Contacts", "n", build)[1] == 3
+    assert cache.memo("Contacts", "n", build)[1] == 3
+    cache.put("Contacts", frame(5))  # a new frame gets a fresh memo
+    df, n = cache.memo("Contacts", "n", build)
+    assert (len(df), n, builds) == (5, 5, [3, 5])
+    clock[0] += 61
+    assert cache.memo("Contacts", "n", build) is None
+
+
+def test_invalidate(clock):
+    cache = app.SheetCache(ttl_seconds=60, max_entries=4)
+    cache.put("A", frame(1))
+    cache.put("B", frame(1))
+    cache.invalidate("A")
+    assert cache.get("A") is None and cache.get("B") is not None
+    cache.invalidate()
+    assert cache.stats()["tabs"] == 0
+
+
+def test_contact_writes_invalidate_the_cached_tab(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "get_storage", lambda: sqlite_storage)
+    cache = app.get_sheet_cache()
+    cache.invalidate()
+    df, _ = app.load_contacts()
+    assert app.load_contacts()[0] is df
+    app.update_contacts_sheet(df.iloc[:2])
+    contacts, index = app.load_contacts()
+    assert contacts["Name"].tolist() == ["Alice", "Bob"]
+    assert index.tolist() == ["alice close friends", "bob work"]
@@ -0,0 +1,118 @@
+import datetime
+import sqlite3
+import warnings
+
+import pandas as pd
+
+import app
+from fakes import CONTACT_HEADER, JOURNAL_HEADER, FakeSpreadsheet
+
+
+def test_sqlite_seeds_tabs_from_csv(sqlite_storage):
+    contacts = sqlite_storage.read_tab("Contacts")
+    assert contacts.columns.tolist() == CONTACT_HEADER
+    assert contacts["Name"].tolist() == ["Alice", "Bob", "Charlie", "Diana"]
+    assert sqlite_storage.read_tab("Life_Journal")["Date"].tolist() == ["2026-02-11", "2026-02-10", "2026-02-09"]
+    work = sqlite_storage.read_tab("Work_Journal")
+    assert work.columns.tolist() == JOURNAL_HEADER and work.empty
+
+
+def test_sqlite_unknown_tab_reads_empty(sqlite_storage):
+    assert sqlite_storage.read_tab("Nope").empty
+
+
+def test_sqlite_indexes_date_and_category(sqlite_storage):
+    sqlite_storage.read_tab("Contacts")
+    sqlite_storage.read_tab("Work_Journal")
+    with sqlite3.connect(sqlite_storage.path) as conn:
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_Contacts_Category", "idx_Work_Journal_Date"} <= indexes
+
+
+def test_sqlite_read_tab_since(sqlite_storage):
+    df = sqlite_storage.read_tab_since("Life_Journal", datetime.date(2026, 2, 10))
+    assert df.columns.tolist() == JOURNAL_HEADER
+    assert df["Date"].tolist() == ["2026-02-11", "2026-02-10"]
+
+
+def test_sqlite_append_rows_pads_short_rows(sqlite_storage):
+    sqlite_storage.append_rows("Work_Journal", [["2026-02-12", "shipped it"]])
+    last = sqlite_storage.read_tab("Work_Journal").iloc[-1]
+    assert last["Date"] == "2026-02-12"
+    assert last["Entry 1"] == "shipped it"
+    assert pd.isna(last["Entry 3"])
+
+
+def test_sheets_read_tab_since_fetches_only_the_window():
+    sheet = FakeSpreadsheet({"Life_Journal": [JOURNAL_HEADER,
+                                              ["2026-01-01", "a", "", ""],
+                                              ["2026-01-05", "b", "", ""],
+                                              ["not a date", "c", "", ""],
+                                              ["2026-01-09", "d", "", ""]]})
+    storage = app.SheetsStorage(sheet)
+    df = storage.read_tab_since("Life_Journal", datetime.date(2026, 1, 5))
+    assert df["Entry 1"].tolist() == ["b", "d"]
+    assert "get_all_records" not in sheet.api_calls
+
+
+def _recording_batch_get(worksheet):
+    ranges = []
+    batch_get = worksheet.batch_get
+    worksheet.batch_get = lambda r, **kw: (ranges.append(list(r)), batch_get(r, **kw))[1]
+    return ranges
+
+
+def test_sheets_read_tab_since_fetches_only_new_dates():
+    rows = [[f"2026-01-{d:02d}", f"e{d}", "", ""] for d in range(1, 11)]
+    sheet = FakeSpreadsheet({"Life_Journal": [JOURNAL_HEADER] + rows})
+    ws = sheet.worksheet("Life_Journal")
+    storage = app.SheetsStorage(sheet)
+    ranges = _recording_batch_get(ws)
+    storage.read_tab_since("Life_Journal", datetime.date(2026, 1, 9))
+    # The date column, then the window plus the last row whole, to check it next time
+    assert ranges[:2] == [["1:1", "A2:A"], ["A10:D11", "A11:D11"]]
+
+    ws.rows.append(["2026-01-11", "e11", "", ""])
+    df = storage.read_tab_since("Life_Journal", datetime.date(2026, 1, 9))
+    # Only the last known row (sheet row 11) down is fetched the second time
+    assert ranges[2:] == [["1:1", "A11:D"], ["A10:D12"]]
+    assert df["Entry 1"].tolist() == ["e9", "e10", "e11"]
+
+
+def test_sheets_read_tab_since_notices_rows_changed_above():
+    rows = [[f"2026-01-{d:02d}", f"e{d}", "", ""] for d in range(1, 6)]
+    sheet = FakeSpreadsheet({"Life_Journal": [JOURNAL_HEADER] + rows})
+    ws = sheet.worksheet("Life_Journal")
+    storage = app.SheetsStorage(sheet)
+    storage.read_tab_since("Life_Journal", datetime.date(2026, 1, 1))
+    del ws.rows[2]  # 2026-01-02 deleted by hand
+    df = storage.read_tab_since("Life_Journal", datetime.date(2026, 1, 4))
+    assert df["Entry 1"].tolist() == ["e4", "e5"]
+
+    # A column inserted before Date moves it to B
+    ws.rows = [["Notes"] + JOURNAL_HEADER] + [[""] + r for r in rows]
+    df = storage.read_tab_since("Life_Journal", datetime.date(2026, 1, 5))
+    assert df["Entry 1"].tolist() == ["e5"]
+
+
+def test_sheets_read_tab_since_notices_a_row_deleted_above_a_same_date_row():
+    sheet = FakeSpreadsheet({"Life_Journal": [JOURNAL_HEADER,
+                                              ["2026-02-10", "old", "", ""],
+                                              ["2026-02-11", "first", "", ""]]})
+    ws = sheet.worksheet("Life_Journal")
+    storage = app.SheetsStorage(sheet)
+    storage.read_tab_since("Life_Journal", datetime.date(2026, 2, 11))
+    ws.rows.append(["2026-02-11", "second", "", ""])
+    del ws.rows[1]  # the last known row now holds "second": same date, different row
+    df = storage.read_tab_since("Life_Journal", datetime.date(2026, 2, 11))
+    assert df["Entry 1"].tolist() == ["first", "second"]
+
+
+def test_load_recent_returns_independent_frames(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "get_storage", lambda: sqlite_storage)
+    app.get_sheet_cache().invalidate()
+    recent = app.load_recent(["Life_Journal"], datetime.date(2026, 2, 10))["Life_Journal"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # SettingWithCopyWarning on pandas < 3
+        recent["Date"] = pd.to_datetime(recent["Date"]).dt.date
+    assert recent["Date"].tolist() == [datetime.date(2026, 2, 11), datetime.date(2026, 2, 10)]
@@ -0,0 +1,175 @@
+import datetime
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+import app
+from fakes import JOURNAL_HEADER
+
+ROW = ["2026-02-12", "saved", "", ""]
+
+
+class FlakyStorage:
+    """Wraps a storage; append_rows fails for the tabs in failing, after writing if write_first."""
+
+    def __init__(self, storage, failing=(), write_first=False):
+        self.storage = storage
+        self.failing = set(failing)
+        self.write_first = write_first
+        self.read_tab = storage.read_tab
+        self.read_tab_since = storage.read_tab_since
+
+    def append_rows(self, tab_name, rows):
+        if tab_name in self.failing:
+            if self.write_first:
+                self.storage.append_rows(tab_name, rows)
+            raise TimeoutError("connection dropped")
+        self.storage.append_rows(tab_name, rows)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return app.WriteQueue(str(tmp_path / "queue.db"))
+
+
+def journal(storage, tab_name="Life_Journal"):
+    return storage.read_tab(tab_name).fillna("").values.tolist()
+
+
+def test_flush_appends_and_dequeues(queue, sqlite_storage):
+    queue.storage = sqlite_storage
+    queue.enqueue("Life_Journal", ROW)
+    queue.enqueue("Life_Journal", ["2026-02-13", "again", "", ""])
+    assert queue.flush() == []
+    assert journal(sqlite_storage)[-2:] == [ROW, ["2026-02-13", "again", "", ""]]
+    assert queue.pending("Life_Journal") == []
+    assert queue.stats()["depth"] == 0
+
+
+def test_failing_tab_does_not_hold_up_others(queue, sqlite_storage):
+    queue.storage = FlakyStorage(sqlite_storage, failing={"Life_Journal"})
+    queue.enqueue("Life_Journal", ROW)
+    queue.enqueue("Work_Journal", ROW)
+    assert queue.flush() == ["Life_Journal"]
+    assert journal(sqlite_storage, "Work_Journal")[-1] == ROW
+    assert queue.pending("Life_Journal") == [ROW]
+    assert queue.stats()["last_error"] == "Life_Journal: TimeoutError: connection dropped"
+
+
+def test_rows_are_set_aside_after_max_attempts(queue, sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "WRITE_QUEUE_MAX_ATTEMPTS", 2)
+    queue.storage = FlakyStorage(sqlite_storage, failing={"Life_Journal"})
+    queue.enqueue("Life_Journal", ROW)
+    assert queue.flush() == ["Life_Journal"]
+    assert queue.flush() == []
+    stats = queue.stats()
+    assert (stats["depth"], stats["dead"], stats["last_error"]) == (0, 1, None)
+    assert queue.dead_letters()[["Tab", "Row", "Error"]].values.tolist() == \
+        [["Life_Journal", "2026-02-12, saved, , ", "TimeoutError: connection dropped"]]
+
+    queue.storage = sqlite_storage
+    queue.retry_dead_letters()
+    assert queue.pending("Life_Journal") == [ROW]
+    assert queue.flush() == []
+    assert journal(sqlite_storage)[-1] == ROW
+    assert queue.stats()["dead"] == 0
+
+
+def test_uncertain_failure_is_not_written_twice(queue, sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "_is_sheets_api_error", lambda e: False)
+    before = len(journal(sqlite_storage))
+    queue.storage = FlakyStorage(sqlite_storage, failing={"Life_Journal"}, write_first=True)
+    queue.enqueue("Life_Journal", ROW)
+    assert queue.flush() == ["Life_Journal"]
+    queue.storage = sqlite_storage
+    queue.enqueue("Life_Journal", ROW)  # the same text saved again is a new row
+    assert queue.flush() == []
+    assert journal(sqlite_storage)[before:] == [ROW, ROW]
+
+
+def test_batch_sent_but_not_dequeued_is_not_written_twice(tmp_path, sqlite_storage):
+    class Crash(BaseException):
+        pass  # like the process dying: not an Exception, so flush() can't record it
+
+    class CrashAfterWrite(FlakyStorage):
+        def append_rows(self, tab_name, rows):
+            super().append_rows(tab_name, rows)
+            raise Crash
+
+    path = str(tmp_path / "queue.db")
+    before = len(journal(sqlite_storage))
+    queue = app.WriteQueue(path)
+    queue.storage = CrashAfterWrite(sqlite_storage)
+    queue.enqueue("Life_Journal", ROW)
+    with pytest.raises(Crash):
+        queue.flush()
+
+    restarted = app.WriteQueue(path)
+    restarted.storage = sqlite_storage
+    assert restarted.pending("Life_Journal") == [ROW]
+    assert restarted.flush() == []
+    assert journal(sqlite_storage)[before:] == [ROW]
+    assert restarted.pending("Life_Journal") == []
+
+
+def test_sheets_answer_clears_in_flight(queue, sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "_is_sheets_api_error", lambda e: True)
+    queue.storage = FlakyStorage(sqlite_storage, failing={"Life_Journal"})
+    queue.enqueue("Life_Journal", ROW)
+    assert queue.flush() == ["Life_Journal"]
+    with sqlite3.connect(queue.path) as conn:
+        assert conn.execute("SELECT uncertain, in_flight FROM pending").fetchall() == [(0, 0)]
+
+
+def test_queue_file_without_in_flight_is_upgraded(tmp_path):
+    path = str(tmp_path / "queue.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""CREATE TABLE pending (id INTEGER PRIMARY KEY AUTOINCREMENT, tab_name TEXT NOT NULL,
+                        row TEXT NOT NULL, queued_at REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,
+                        uncertain INTEGER NOT NULL DEFAULT 0)""")
+        conn.execute("INSERT INTO pending (tab_name, row, queued_at) VALUES ('Life_Journal', '[\"a\"]', 0)")
+    queue = app.WriteQueue(path)
+    assert queue.pending("Life_Journal") == [["a"]]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT in_flight FROM pending").fetchall() == [(0,)]
+
+
+def test_read_waits_for_a_batch_in_flight(queue, sqlite_storage):
+    snapshots = []
+
+    class Watching(FlakyStorage):
+        def append_rows(self, tab_name, rows):
+            reader = threading.Thread(target=lambda: snapshots.append(
+                queue.read(tab_name, lambda: sqlite_storage.read_tab(tab_name))))
+            reader.start()
+            reader.join(0.2)
+            assert reader.is_alive()  # blocked until the batch is appended and dequeued
+            super().append_rows(tab_name, rows)
+            self.reader = reader
+
+    queue.storage = Watching(sqlite_storage)
+    queue.enqueue("Life_Journal", ROW)
+    queue.flush()
+    queue.storage.reader.join()
+    df, pending = snapshots[0]
+    assert df.fillna("").values.tolist()[-1] == ROW and pending == []
+
+
+def test_with_pending_adds_queued_rows_to_an_empty_window():
+    empty = pd.DataFrame(columns=JOURNAL_HEADER)
+    assert app._with_pending(empty, [ROW]).values.tolist() == [ROW]
+    assert app._with_pending(pd.DataFrame(), [ROW]).empty
+    assert app._with_pending(empty, []) is empty
+
+
+def test_load_recent_includes_a_save_not_yet_flushed(queue, sqlite_storage, monkeypatch):
+    monkeypatch.setattr(app, "get_storage", lambda: sqlite_storage)
+    monkeypatch.setattr(app, "_running_write_queue", lambda: queue)
+    app.get_sheet_cache().invalidate()
+    today = datetime.date.today()
+    queue.enqueue("Life_Journal", [str(today), "just saved", "", ""])
+    recent = app.load_recent(["Life_Journal", "Work_Journal"], today - datetime.timedelta(days=7))
+    assert recent["Life_Journal"]["Entry 1"].tolist() == ["just saved"]
+    assert recent["Work_Journal"].empty